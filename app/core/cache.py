@@ -0,0 +1,102 @@
+"""
+In-process caching utilities.
+Provides a bounded LRU cache with per-entry time-to-live.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.metrics import register_collector
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a fixed TTL.
+    
+    Intended for small, hot lookups shared by all requests of a worker.
+    Not thread-safe; it is only used from the event loop.
+    """
+    
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        """
+        Create a cache and register its metrics.
+        
+        Args:
+            name: Cache name used in the metrics report
+            maxsize: Maximum number of entries before LRU eviction
+            ttl: Entry lifetime in seconds (0 disables caching)
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        register_collector(f"cache.{name}", self.stats)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for a key, or None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+        """
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry, if present."""
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report size and hit/miss/eviction counters.
+        
+        Returns:
+            Dictionary of cache metrics
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -20,6 +20,43 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Maximum concurrent bcrypt operations per worker (dedicated thread pool)
+    PASSWORD_HASH_WORKERS: int = 4
+    
+    # Authenticated principal cache (bounds how long is_active changes can lag)
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    
+    # Team document cache (bounds how long other workers see stale team details)
+    TEAM_CACHE_MAX_SIZE: int = 10000
+    TEAM_CACHE_TTL_SECONDS: float = 300.0
+    
+    # Team permission snapshots: size, idle lifetime, and how long a
+    # snapshot is trusted before its membership version is rechecked
+    PERMISSION_CACHE_MAX_SIZE: int = 1000
+    PERMISSION_CACHE_TTL_SECONDS: float = 300.0
+    PERMISSION_CACHE_STALENESS_SECONDS: float = 5.0
+    
+    # Task stats cache per team and visibility scope
+    TASK_STATS_CACHE_MAX_SIZE: int = 10000
+    TASK_STATS_CACHE_TTL_SECONDS: float = 15.0
+    
+    # Team stats reconciliation: interval (0 disables) and pause between teams
+    TEAM_STATS_RECONCILE_INTERVAL_SECONDS: float = 21600.0
+    TEAM_STATS_RECONCILE_DELAY_SECONDS: float = 0.05
+    
+    # Delta sync: seconds of changes repeated on every sync, so writes
+    # committed late or from workers with skewed clocks are not missed
+    TASK_SYNC_OVERLAP_SECONDS: float = 5.0
+    
+    # Team event streams: per-subscriber queue bound and keepalive interval
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    
+    # Background team deletion: documents per batch and pause between batches
+    TEAM_DELETE_BATCH_SIZE: int = 1000
+    TEAM_DELETE_BATCH_DELAY_SECONDS: float = 0.1
+    
     # Application Configuration
     APP_NAME: str = "ClickUp-like SaaS Backend"
     APP_VERSION: str = "1.0.0"
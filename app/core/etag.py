@@ -0,0 +1,50 @@
+"""
+Entity tag helpers for conditional GET requests.
+List endpoints derive a weak ETag from a cheap version lookup so that
+unchanged polls can be answered with 304 before running the query.
+"""
+import hashlib
+from typing import Any, Optional
+
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the values that determine a response.
+    
+    Args:
+        parts: Values such as the resource version, caller scope and query
+    
+    Returns:
+        Weak ETag header value
+    """
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current ETag.
+    
+    Uses weak comparison, as required for If-None-Match.
+    
+    Args:
+        if_none_match: Raw If-None-Match header value, if any
+        etag: Current ETag of the resource
+    
+    Returns:
+        True if the client's cached representation is still current
+    """
+    if not if_none_match:
+        return False
+    
+    if if_none_match.strip() == "*":
+        return True
+    
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
@@ -0,0 +1,207 @@
+"""
+In-process publish/subscribe hub for team change events.
+Services publish task and membership changes; each SSE stream holds a
+bounded subscription that drops its backlog and asks the client to
+resync when it falls behind.
+"""
+import asyncio
+import itertools
+from typing import Any, Callable, Dict, Optional, Set
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.core.metrics import register_collector
+
+
+# Event types
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+TASK_ASSIGNED = "task.assigned"
+TASK_DELETED = "task.deleted"
+MEMBERSHIP_ADDED = "membership.added"
+MEMBERSHIP_UPDATED = "membership.updated"
+MEMBERSHIP_REMOVED = "membership.removed"
+TEAM_DELETED = "team.deleted"
+
+# Sent in place of dropped events; the client should refetch its lists
+RESYNC = "resync"
+
+
+class EventBroker:
+    """
+    Transport between publishers and the hub's local subscribers.
+    
+    The default broker delivers in process. To fan out across workers,
+    subclass it to publish to a shared broker (Redis pub/sub, NATS, ...)
+    and call `deliver` for every message received from it; messages
+    must then be encoded with `bson.json_util` to keep ObjectIds.
+    """
+    
+    def __init__(self):
+        self.deliver: Optional[Callable[[Dict[str, Any]], None]] = None
+    
+    async def start(self, deliver: Callable[[Dict[str, Any]], None]) -> None:
+        """Begin delivering published events to `deliver`."""
+        self.deliver = deliver
+    
+    async def stop(self) -> None:
+        """Stop delivering events."""
+        self.deliver = None
+    
+    async def publish(self, event: Dict[str, Any]) -> None:
+        """Send an event to every hub, including this one."""
+        if self.deliver is not None:
+            self.deliver(event)
+
+
+class Subscription:
+    """
+    One subscriber's bounded event queue for a team.
+    
+    When the queue is full, the backlog is discarded and replaced by a
+    single resync event, so a slow client costs bounded memory and
+    learns that it missed changes.
+    """
+    
+    def __init__(
+        self,
+        team_id: ObjectId,
+        accepts: Callable[[Dict[str, Any]], bool],
+        maxsize: int
+    ):
+        """
+        Args:
+            team_id: Team whose events are wanted
+            accepts: Predicate deciding whether an event is visible
+            maxsize: Maximum number of queued events
+        """
+        self.team_id = team_id
+        self.accepts = accepts
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize)
+    
+    def offer(self, event: Dict[str, Any]) -> int:
+        """
+        Queue an event, falling back to a resync when full.
+        
+        Returns:
+            Number of events dropped (0 if the event was queued)
+        """
+        try:
+            self.queue.put_nowait(event)
+            return 0
+        except asyncio.QueueFull:
+            pass
+        
+        dropped = 1
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            dropped += 1
+        self.queue.put_nowait({"type": RESYNC, "team_id": self.team_id, "id": event["id"]})
+        return dropped
+    
+    async def get(self) -> Dict[str, Any]:
+        """Wait for the next event."""
+        return await self.queue.get()
+
+
+class EventHub:
+    """Routes published events to the subscriptions of their team."""
+    
+    def __init__(self, broker: EventBroker, queue_size: int):
+        """
+        Create a hub and register its metrics.
+        
+        Args:
+            broker: Transport used to publish events
+            queue_size: Per-subscriber queue bound
+        """
+        self.broker = broker
+        self.queue_size = queue_size
+        self._subscriptions: Dict[ObjectId, Set[Subscription]] = {}
+        self._ids = itertools.count(1)
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.resyncs = 0
+        register_collector("events", self.stats)
+    
+    async def start(self) -> None:
+        """Connect the hub to its broker. Call once on startup."""
+        await self.broker.start(self._deliver)
+    
+    async def stop(self) -> None:
+        """Disconnect from the broker. Call once on shutdown."""
+        await self.broker.stop()
+    
+    async def publish(self, event_type: str, team_id: ObjectId, **payload: Any) -> None:
+        """
+        Publish a change event for a team.
+        
+        Args:
+            event_type: One of the event type constants
+            team_id: Team ObjectId
+            **payload: Event data, e.g. `task` and `previous` documents
+        """
+        self.published += 1
+        await self.broker.publish({"type": event_type, "team_id": team_id, **payload})
+    
+    def subscribe(
+        self,
+        team_id: ObjectId,
+        accepts: Callable[[Dict[str, Any]], bool]
+    ) -> Subscription:
+        """
+        Subscribe to a team's events.
+        
+        Args:
+            team_id: Team ObjectId
+            accepts: Predicate deciding whether an event is visible
+        
+        Returns:
+            Subscription to read events from; pass it to `unsubscribe`
+            when done
+        """
+        subscription = Subscription(team_id, accepts, self.queue_size)
+        self._subscriptions.setdefault(team_id, set()).add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription."""
+        subscriptions = self._subscriptions.get(subscription.team_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.team_id]
+    
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        """Offer an event received from the broker to local subscribers."""
+        event = {**event, "id": next(self._ids)}
+        for subscription in list(self._subscriptions.get(event["team_id"], ())):
+            if not subscription.accepts(event):
+                continue
+            self.delivered += 1
+            dropped = subscription.offer(event)
+            if dropped:
+                self.dropped += dropped
+                self.resyncs += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report subscriber and event counters.
+        
+        Returns:
+            Dictionary of hub metrics
+        """
+        return {
+            "teams": len(self._subscriptions),
+            "subscribers": sum(len(s) for s in self._subscriptions.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "resyncs": self.resyncs,
+        }
+
+
+# Hub shared by the services and the SSE route of this worker
+event_hub = EventHub(EventBroker(), queue_size=settings.EVENTS_QUEUE_SIZE)
@@ -0,0 +1,113 @@
+"""
+Sparse fieldset helpers.
+Turn a `fields=` query parameter into a MongoDB projection and trim
+documents to the requested response fields.
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Type
+
+from pydantic import BaseModel
+
+from app.core.serialization import BSONJSONResponse
+
+
+def response_fields(model: Type[BaseModel]) -> Set[str]:
+    """
+    List the keys a response model produces (aliases where defined).
+    
+    Args:
+        model: Pydantic response model
+    
+    Returns:
+        Set of response field names
+    """
+    return {field.alias or name for name, field in model.model_fields.items()}
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[Set[str]]:
+    """
+    Parse a comma-separated `fields=` value.
+    
+    `_id` is always included so clients can key the results.
+    
+    Args:
+        fields: Raw query parameter value
+        allowed: Field names the endpoint can return
+    
+    Returns:
+        Set of requested field names, or None to return every field
+    
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not fields:
+        return None
+    
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    
+    requested.add("_id")
+    return requested
+
+
+def build_projection(
+    fields: Set[str],
+    sources: Optional[Mapping[str, str]] = None
+) -> Dict[str, int]:
+    """
+    Build a MongoDB projection for the requested response fields.
+    
+    Populated fields (such as names resolved from another collection)
+    are not stored on the document; `sources` maps each of them to the
+    stored reference field it is derived from.
+    
+    Args:
+        fields: Requested response field names
+        sources: Mapping of populated field -> stored source field
+    
+    Returns:
+        MongoDB projection document
+    """
+    sources = sources or {}
+    return {sources.get(name, name): 1 for name in fields}
+
+
+def select_fields(document: Dict[str, Any], fields: Set[str]) -> Dict[str, Any]:
+    """
+    Trim a document to the requested response fields.
+    
+    Args:
+        document: Document returned by a service
+        fields: Requested response field names
+    
+    Returns:
+        New dictionary with only the requested fields that are present,
+        in document order
+    """
+    return {name: value for name, value in document.items() if name in fields}
+
+
+def partial_response(
+    documents: List[Dict[str, Any]],
+    fields: Set[str],
+    headers: Optional[Dict[str, str]] = None
+) -> BSONJSONResponse:
+    """
+    Build a JSON list response containing only the requested fields.
+    
+    Trimmed documents don't satisfy the full response model, so they
+    are encoded directly instead of going through it.
+    
+    Args:
+        documents: Documents returned by a service
+        fields: Requested response field names
+        headers: Optional extra response headers
+        
+    Returns:
+        BSONJSONResponse with ObjectIds rendered as strings
+    """
+    return BSONJSONResponse(
+        [select_fields(document, fields) for document in documents],
+        headers=headers
+    )
@@ -0,0 +1,30 @@
+"""
+In-process metrics registry.
+Components register a collector that returns their current counters;
+the /metrics endpoint reports all of them for this worker.
+"""
+from typing import Any, Callable, Dict
+
+
+_collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_collector(name: str, collector: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Register a metrics collector.
+    
+    Args:
+        name: Metric group name shown in the report
+        collector: Callable returning a dictionary of counters
+    """
+    _collectors[name] = collector
+
+
+def collect_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Collect the current value of every registered metric group.
+    
+    Returns:
+        Mapping of metric group name to its counters
+    """
+    return {name: collector() for name, collector in _collectors.items()}
@@ -0,0 +1,76 @@
+"""
+Keyset (cursor) pagination helpers.
+Cursors are opaque, URL-safe tokens that encode the sort key of the
+last item on a page, so the next page starts with an index seek instead
+of skipping over every earlier entry.
+"""
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Sequence
+from bson import json_util
+
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """
+    Encode sort key values into an opaque cursor string.
+    
+    Args:
+        values: Mapping of sort field name to value (ObjectId, datetime, ...)
+    
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json_util.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[str] = ("_id",)) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    
+    Args:
+        cursor: Cursor string from a previous response
+        keys: Sort fields the cursor must contain
+    
+    Returns:
+        Mapping of sort field name to value
+    
+    Raises:
+        ValueError: If the cursor is malformed or missing a sort field
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    
+    if not isinstance(values, dict) or any(key not in values for key in keys):
+        raise ValueError("Invalid cursor")
+    
+    return values
+
+
+def next_cursor(
+    items: List[Dict[str, Any]],
+    limit: int,
+    keys: Sequence[str] = ("_id",)
+) -> Optional[str]:
+    """
+    Build the cursor for the page after `items`.
+    
+    Args:
+        items: Documents on the current page, in sort order
+        limit: Page size that was requested
+        keys: Sort fields to encode from the last document
+    
+    Returns:
+        Cursor string, or None if this was the last page
+    """
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor({key: last[key] for key in keys})
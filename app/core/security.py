@@ -1,11 +1,18 @@
 """
 Security utilities for password hashing and JWT token management.
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, TypeVar
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from app.core.config import settings
+from app.core.metrics import register_collector
+
+
+T = TypeVar("T")
 
 
 # Password hashing context using bcrypt
@@ -43,6 +50,106 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHasherPool:
+    """
+    Dedicated thread pool for bcrypt work.
+    
+    bcrypt takes 100-300 ms per call; running it here keeps the event
+    loop free for other requests. The pool size caps how many hashes run
+    at once, extra calls wait in the executor queue.
+    """
+    
+    def __init__(self, max_workers: int):
+        """
+        Create the pool and register its metrics.
+        
+        Args:
+            max_workers: Maximum number of concurrent bcrypt operations
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.running = 0
+        self.completed = 0
+        register_collector("password_hashing", self.stats)
+    
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run a blocking hashing function in the pool and await its result.
+        """
+        self.submitted += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._call, fn, *args
+            )
+        finally:
+            self.completed += 1
+    
+    def _call(self, fn: Callable[..., T], *args) -> T:
+        # Runs in a pool thread, so the shared counter needs the lock
+        with self._lock:
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a free worker."""
+        return max(self.submitted - self.completed - self.running, 0)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report pool size, running and queued operations.
+        
+        Returns:
+            Dictionary of pool metrics
+        """
+        return {
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+        }
+
+
+# Global pool for password hashing and verification
+password_hasher = PasswordHasherPool(settings.PASSWORD_HASH_WORKERS)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password in the password hashing pool.
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Hashed password string
+    """
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in the password hashing pool.
+    
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password to compare against
+        
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -0,0 +1,92 @@
+"""
+Fast response serialization for trusted service output.
+Renders MongoDB documents straight to JSON with orjson, converting
+ObjectIds on the fly, instead of converting ids by hand and validating
+the result again through the response model.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    """Encode BSON types orjson doesn't know natively."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as JSON bytes.
+    
+    ObjectIds become hex strings and naive datetimes ISO 8601 strings,
+    matching the output of the Pydantic response models.
+    """
+    return orjson.dumps(content, default=_default)
+
+
+class BSONJSONResponse(Response):
+    """JSON response that accepts MongoDB documents as content."""
+    
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class DocumentSerializer:
+    """
+    Shapes documents to the keys of a response model without validating.
+    
+    Only the model's fields are emitted (by alias), in model order, with
+    missing optional fields set to their default. Use it for documents
+    produced by the services, whose types already match the model.
+    """
+    
+    def __init__(self, model: Type[BaseModel]):
+        """
+        Precompute the output keys and defaults of a response model.
+        
+        Args:
+            model: Pydantic response model the output must match
+        """
+        self.fields = [
+            (field.alias or name, None if field.is_required() else field.default)
+            for name, field in model.model_fields.items()
+        ]
+    
+    def one(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a single document."""
+        return {key: document.get(key, default) for key, default in self.fields}
+    
+    def many(self, documents: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Shape a list of documents."""
+        fields = self.fields
+        return [
+            {key: document.get(key, default) for key, default in fields}
+            for document in documents
+        ]
+    
+    def response(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None
+    ) -> BSONJSONResponse:
+        """
+        Build a response from one document or a list of documents.
+        
+        Args:
+            content: Document or list of documents
+            status_code: HTTP status code
+            headers: Optional extra response headers
+        
+        Returns:
+            BSONJSONResponse with the shaped content
+        """
+        shaped = self.many(content) if isinstance(content, list) else self.one(content)
+        return BSONJSONResponse(shaped, status_code=status_code, headers=headers)
@@ -2,12 +2,93 @@
 MongoDB collection names and index definitions.
 Centralizes collection naming for consistency.
 """
+from pymongo import IndexModel
 
 # Collection names
 USERS_COLLECTION = "users"
 TEAMS_COLLECTION = "teams"
 MEMBERSHIPS_COLLECTION = "memberships"
 TASKS_COLLECTION = "tasks"
+MIGRATIONS_COLLECTION = "migrations"
+TEAM_VERSIONS_COLLECTION = "team_versions"
+JOBS_COLLECTION = "jobs"
+TEAM_STATS_COLLECTION = "team_stats"
+TASK_TOMBSTONES_COLLECTION = "task_tombstones"
+LOCKS_COLLECTION = "locks"
+
+# How long deleted tasks are remembered for delta sync
+TASK_TOMBSTONE_TTL_SECONDS = 7 * 24 * 3600
+
+
+# Task indexes per visibility scope. The Sub-Admin one is multikey, with
+# one entry per manager in the assignee's management chain.
+TASK_ASSIGNEE_INDEX = [("team_id", 1), ("assigned_to", 1), ("_id", 1), ("status", 1), ("priority", 1)]
+TASK_MANAGER_INDEX = [("team_id", 1), ("manager_ids", 1), ("_id", 1), ("assigned_to", 1), ("status", 1), ("priority", 1)]
+
+# Title prefix (type-ahead) search. The trailing visibility keys let
+# Sub-Admin and Member scopes be filtered on index keys alone.
+TASK_TITLE_INDEX = [("team_id", 1), ("title_key", 1), ("_id", 1), ("assigned_to", 1), ("manager_ids", 1)]
+
+
+# Declared index set, derived from the query shapes in app/services and
+# app/dependencies. benchmarks/query_plans.py checks every shape against
+# these indexes with explain().
+INDEXES = {
+    USERS_COLLECTION: [
+        # Login and registration lookups
+        IndexModel([("email", 1)], unique=True),
+    ],
+    MEMBERSHIPS_COLLECTION: [
+        # A user can't join the same team twice; also serves lookups by user
+        IndexModel([("user_id", 1), ("team_id", 1)], unique=True),
+        # Member pages filtered by direct manager
+        IndexModel([("team_id", 1), ("managed_by", 1), ("_id", 1)]),
+        # Everyone below a Sub-Admin, and subtree rewrites in _id batches
+        IndexModel([("team_id", 1), ("ancestors", 1), ("_id", 1)]),
+        # Member pages filtered by role
+        IndexModel([("team_id", 1), ("role", 1), ("_id", 1)]),
+        # Member pages and _id-range batches of a team's memberships (team deletion)
+        IndexModel([("team_id", 1), ("_id", 1)]),
+    ],
+    TEAMS_COLLECTION: [
+        # Teams left mid-deletion, resumed on startup
+        IndexModel([("deleting_at", 1)], sparse=True),
+    ],
+    JOBS_COLLECTION: [
+        # Unfinished jobs, resumed on startup
+        IndexModel([("type", 1), ("status", 1)]),
+        # Finished jobs are kept for a week for progress polling
+        IndexModel([("finished_at", 1)], expireAfterSeconds=7 * 24 * 3600),
+    ],
+    LOCKS_COLLECTION: [
+        # Expired leases are removed after a day
+        IndexModel([("expires_at", 1)], expireAfterSeconds=24 * 3600),
+    ],
+    TASKS_COLLECTION: [
+        # Keyset-paginated listings (sorted by _id) for each visibility scope
+        IndexModel([("team_id", 1), ("_id", 1)]),
+        IndexModel(TASK_ASSIGNEE_INDEX),
+        IndexModel(TASK_MANAGER_INDEX),
+        # Title prefix search, sorted by (title_key, _id)
+        IndexModel(TASK_TITLE_INDEX),
+        # Cross-team "my tasks" inbox, merged per status in updated_at order
+        IndexModel([("assigned_to", 1), ("status", 1), ("updated_at", 1), ("_id", 1), ("team_id", 1)]),
+        # Delta sync, read in (updated_at, _id) order; trailing visibility keys as above
+        IndexModel([("team_id", 1), ("updated_at", 1), ("_id", 1), ("assigned_to", 1), ("manager_ids", 1)]),
+        # Full-text search within a team; $text queries must match team_id
+        IndexModel(
+            [("team_id", 1), ("title", "text"), ("description", "text")],
+            weights={"title": 10, "description": 1},
+            name="task_text"
+        ),
+    ],
+    TASK_TOMBSTONES_COLLECTION: [
+        # Delta sync, read in (deleted_at, _id) order
+        IndexModel([("team_id", 1), ("deleted_at", 1), ("_id", 1), ("assigned_to", 1), ("manager_ids", 1)]),
+        # Tombstones expire once no sync token can still need them
+        IndexModel([("deleted_at", 1)], expireAfterSeconds=TASK_TOMBSTONE_TTL_SECONDS),
+    ],
+}
 
 
 async def create_indexes(db):
@@ -15,25 +96,14 @@ async def create_indexes(db):
     Create database indexes for optimal query performance.
     Should be called once on application startup.
     
+    Indexes that are no longer declared are left in place here; the
+    `drop_legacy_indexes` migration removes the ones earlier versions
+    created.
+    
     Args:
         db: AsyncIOMotorDatabase instance
     """
-    
-    # Users collection indexes
-    await db[USERS_COLLECTION].create_index("email", unique=True)
-    
-    # Memberships collection indexes
-    # Compound index to ensure user can't join same team twice
-    await db[MEMBERSHIPS_COLLECTION].create_index(
-        [("user_id", 1), ("team_id", 1)],
-        unique=True
-    )
-    await db[MEMBERSHIPS_COLLECTION].create_index("team_id")
-    await db[MEMBERSHIPS_COLLECTION].create_index("managed_by")
-    
-    # Tasks collection indexes
-    await db[TASKS_COLLECTION].create_index("team_id")
-    await db[TASKS_COLLECTION].create_index("assigned_to")
-    await db[TASKS_COLLECTION].create_index("created_by")
+    for collection, indexes in INDEXES.items():
+        await db[collection].create_indexes(indexes)
     
     print("✓ Database indexes created")
@@ -0,0 +1,200 @@
+"""
+One-off data migrations.
+Each migration runs once per database and is recorded in the
+migrations collection so later startups skip it.
+"""
+from datetime import datetime
+from pymongo import UpdateMany, UpdateOne
+
+from app.db.collections import MIGRATIONS_COLLECTION, MEMBERSHIPS_COLLECTION, TASKS_COLLECTION
+from app.models.task import TaskModel
+
+
+# Number of update operations sent per bulk_write
+BATCH_SIZE = 500
+
+# Indexes created by earlier versions and since replaced: the single-field
+# indexes superseded by the compound set, the shorter task scope and
+# `(team_id, managed_by)` indexes, and those on `manager_id`
+LEGACY_INDEXES = {
+    MEMBERSHIPS_COLLECTION: [
+        "team_id_1",
+        "managed_by_1",
+        "team_id_1_managed_by_1",
+    ],
+    TASKS_COLLECTION: [
+        "team_id_1",
+        "assigned_to_1",
+        "created_by_1",
+        "team_id_1_assigned_to_1__id_1",
+        "team_id_1_manager_id_1__id_1",
+        "team_id_1_manager_id_1__id_1_assigned_to_1_status_1_priority_1",
+        "team_id_1_title_key_1__id_1_assigned_to_1_manager_id_1",
+    ],
+}
+
+
+async def backfill_task_managers(db):
+    """
+    Set `manager_id` on tasks created before it was denormalized.
+    
+    Copies each managed membership's `managed_by` onto the member's tasks
+    in that team, then marks every remaining task as unmanaged.
+    
+    Args:
+        db: AsyncIOMotorDatabase instance
+    """
+    missing = {"manager_id": {"$exists": False}}
+    operations = []
+    
+    cursor = db[MEMBERSHIPS_COLLECTION].find(
+        {"managed_by": {"$ne": None}},
+        {"user_id": 1, "team_id": 1, "managed_by": 1}
+    )
+    async for membership in cursor:
+        operations.append(UpdateMany(
+            {**missing, "team_id": membership["team_id"], "assigned_to": membership["user_id"]},
+            {"$set": {"manager_id": membership["managed_by"]}}
+        ))
+        if len(operations) >= BATCH_SIZE:
+            await db[TASKS_COLLECTION].bulk_write(operations, ordered=False)
+            operations = []
+    
+    if operations:
+        await db[TASKS_COLLECTION].bulk_write(operations, ordered=False)
+    
+    await db[TASKS_COLLECTION].update_many(missing, {"$set": {"manager_id": None}})
+
+
+async def build_team_stats(db):
+    """
+    Compute the `team_stats` counters of every existing team.
+    
+    Args:
+        db: AsyncIOMotorDatabase instance
+    """
+    # Imported here: services depend on app.db, not the other way round
+    from app.services.team_stats_service import TeamStatsService
+    
+    await TeamStatsService.reconcile_all(db)
+
+
+async def backfill_task_title_keys(db):
+    """
+    Set the normalized `title_key` used by prefix search on existing tasks.
+    
+    Args:
+        db: AsyncIOMotorDatabase instance
+    """
+    operations = []
+    cursor = db[TASKS_COLLECTION].find({"title_key": {"$exists": False}}, {"title": 1})
+    async for task in cursor:
+        operations.append(UpdateOne(
+            {"_id": task["_id"]},
+            {"$set": {"title_key": TaskModel.title_key(task["title"])}}
+        ))
+        if len(operations) >= BATCH_SIZE:
+            await db[TASKS_COLLECTION].bulk_write(operations, ordered=False)
+            operations = []
+    
+    if operations:
+        await db[TASKS_COLLECTION].bulk_write(operations, ordered=False)
+
+
+async def build_management_chains(db):
+    """
+    Store each membership's management chain and copy it onto tasks.
+    
+    Chains are followed through `managed_by` within each team and stored
+    as the membership's `ancestors`; a chain stops at a repeated manager.
+    Tasks get their assignee's chain as `manager_ids` in place of
+    `manager_id`, and the stats are recomputed since Sub-Admin counts now
+    include indirect reports.
+    
+    Args:
+        db: AsyncIOMotorDatabase instance
+    """
+    from app.services.team_stats_service import TeamStatsService
+    
+    async def write(collection, operations):
+        for start in range(0, len(operations), BATCH_SIZE):
+            await db[collection].bulk_write(operations[start:start + BATCH_SIZE], ordered=False)
+    
+    for team_id in await db[MEMBERSHIPS_COLLECTION].distinct("team_id"):
+        memberships = await db[MEMBERSHIPS_COLLECTION].find(
+            {"team_id": team_id},
+            {"user_id": 1, "managed_by": 1}
+        ).to_list(length=None)
+        managers = {m["user_id"]: m.get("managed_by") for m in memberships}
+        
+        membership_ops, task_ops = [], []
+        for membership in memberships:
+            user_id, chain = membership["user_id"], []
+            manager = managers[user_id]
+            while manager is not None and manager != user_id and manager not in chain:
+                chain.append(manager)
+                manager = managers.get(manager)
+            
+            membership_ops.append(UpdateOne({"_id": membership["_id"]}, {"$set": {"ancestors": chain}}))
+            if chain:
+                task_ops.append(UpdateMany(
+                    {"team_id": team_id, "assigned_to": user_id},
+                    {"$set": {"manager_ids": chain}}
+                ))
+        
+        await write(MEMBERSHIPS_COLLECTION, membership_ops)
+        await write(TASKS_COLLECTION, task_ops)
+    
+    await db[TASKS_COLLECTION].update_many(
+        {"manager_ids": {"$exists": False}},
+        {"$set": {"manager_ids": []}}
+    )
+    await db[TASKS_COLLECTION].update_many(
+        {"manager_id": {"$exists": True}},
+        {"$unset": {"manager_id": ""}}
+    )
+    await TeamStatsService.reconcile_all(db)
+
+
+async def drop_legacy_indexes(db):
+    """
+    Drop the indexes earlier versions created that LEGACY_INDEXES lists.
+    
+    Any other index, including ones added by operators, is left alone.
+    
+    Args:
+        db: AsyncIOMotorDatabase instance
+    """
+    for collection, names in LEGACY_INDEXES.items():
+        existing = await db[collection].index_information()
+        for name in names:
+            if name in existing:
+                await db[collection].drop_index(name)
+                print(f"✓ Dropped index {collection}.{name}")
+
+
+# Ordered list of (name, coroutine function) migrations
+MIGRATIONS = [
+    ("task_manager_id", backfill_task_managers),
+    ("team_stats", build_team_stats),
+    ("task_title_key", backfill_task_title_keys),
+    ("management_chains", build_management_chains),
+    ("drop_legacy_indexes", drop_legacy_indexes),
+]
+
+
+async def run_migrations(db):
+    """
+    Apply every migration that has not yet run on this database.
+    Should be called once on application startup, after indexes.
+    
+    Args:
+        db: AsyncIOMotorDatabase instance
+    """
+    for name, migration in MIGRATIONS:
+        if await db[MIGRATIONS_COLLECTION].find_one({"_id": name}):
+            continue
+        
+        await migration(db)
+        await db[MIGRATIONS_COLLECTION].insert_one({"_id": name, "applied_at": datetime.utcnow()})
+        print(f"✓ Migration applied: {name}")
@@ -7,6 +7,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from bson import ObjectId
 from typing import Dict, Any
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import decode_access_token
 from app.db.mongodb import get_database
 from app.db.collections import USERS_COLLECTION
@@ -15,6 +17,15 @@ from app.db.collections import USERS_COLLECTION
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Per-worker cache of authenticated users, keyed by user ObjectId. Nothing
+# in the API edits or deactivates users, so entries are never invalidated;
+# a change made directly in the database applies once the TTL runs out.
+principal_cache = TTLCache(
+    "principals",
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -23,7 +34,9 @@ async def get_current_user(
     """
     Dependency to get the current authenticated user.
     
-    Validates JWT token and retrieves user from database.
+    Validates JWT token and retrieves user from database. Users are
+    served from a short-lived per-worker cache, so a change such as
+    deactivation takes effect within PRINCIPAL_CACHE_TTL_SECONDS.
     
     Args:
         credentials: Bearer token from request header
@@ -55,20 +68,29 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Retrieve user from database
     try:
-        user = await db[USERS_COLLECTION].find_one({"_id": ObjectId(user_id)})
+        user_obj_id = ObjectId(user_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid user ID",
         )
     
+    # Retrieve user from cache, falling back to the database
+    user = principal_cache.get(user_obj_id)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+        user = await db[USERS_COLLECTION].find_one(
+            {"_id": user_obj_id},
+            {"hashed_password": 0}
         )
+        
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        
+        principal_cache.set(user_obj_id, user)
     
     if not user.get("is_active", True):
         raise HTTPException(
@@ -76,4 +98,5 @@ async def get_current_user(
             detail="Inactive user account",
         )
     
-    return user
+    # Hand out a copy so routes can't mutate the cached document
+    return dict(user)
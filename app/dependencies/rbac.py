@@ -9,7 +9,8 @@ from typing import Dict, Any, List, Optional
 from app.dependencies.auth import get_current_user
 from app.db.mongodb import get_database
 from app.db.collections import MEMBERSHIPS_COLLECTION, TASKS_COLLECTION
-from app.models.membership import Role
+from app.models.membership import Role, ACTIVE_MEMBERSHIP_FILTER
+from app.services.permission_service import PermissionService
 
 
 async def get_user_membership(
@@ -20,13 +21,16 @@ async def get_user_membership(
     """
     Get user's membership in a specific team.
     
+    Answered from the team's permission snapshot, so the RBAC checks of
+    a request (and of later requests) share one membership read.
+    
     Args:
         team_id: Team ID to check
         current_user: Current authenticated user
         db: Database instance
         
     Returns:
-        Membership document
+        Membership document (shared; do not mutate)
         
     Raises:
         HTTPException 403: If user is not a member of the team
@@ -39,10 +43,8 @@ async def get_user_membership(
             detail="Invalid team ID format"
         )
     
-    membership = await db[MEMBERSHIPS_COLLECTION].find_one({
-        "user_id": current_user["_id"],
-        "team_id": team_obj_id
-    })
+    permissions = await PermissionService.get_permissions(db, team_obj_id)
+    membership = permissions.membership(current_user["_id"])
     
     if not membership:
         raise HTTPException(
@@ -112,7 +114,8 @@ async def can_manage_user(
     Check if current user can manage the target user.
     
     Admin can manage anyone.
-    Sub-Admin can manage only their assigned members.
+    Sub-Admin can manage only members below them in the management
+    hierarchy, directly or through other Sub-Admins.
     
     Args:
         team_id: Team ID
@@ -135,8 +138,14 @@ async def can_manage_user(
             detail="Invalid ID format"
         )
     
-    # Get current user's membership
-    current_membership = await get_user_membership(team_id, current_user, db)
+    # Both memberships come from the team's permission snapshot
+    permissions = await PermissionService.get_permissions(db, team_obj_id)
+    current_membership = permissions.membership(current_user["_id"])
+    if not current_membership:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not a member of this team"
+        )
     
     # Admins can manage anyone
     if current_membership["role"] == Role.ADMIN:
@@ -144,19 +153,14 @@ async def can_manage_user(
     
     # Sub-Admins can only manage their assigned members
     if current_membership["role"] == Role.SUBADMIN:
-        target_membership = await db[MEMBERSHIPS_COLLECTION].find_one({
-            "user_id": target_obj_id,
-            "team_id": team_obj_id
-        })
-        
-        if not target_membership:
+        if not permissions.membership(target_obj_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Target user is not a member of this team"
             )
         
-        # Check if this member is managed by the current sub-admin
-        if target_membership.get("managed_by") == current_user["_id"]:
+        # Check if the current sub-admin is in this member's management chain
+        if permissions.manages(current_user["_id"], target_obj_id):
             return True
     
     raise HTTPException(
@@ -195,27 +199,253 @@ async def filter_visible_tasks(
     
     membership = await get_user_membership(team_id, current_user, db)
     
+    return build_visible_tasks_filter(team_obj_id, current_user, membership)
+
+
+def build_visible_tasks_filter(
+    team_id: ObjectId,
+    current_user: Dict[str, Any],
+    membership: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build the visible-tasks filter from an already loaded membership.
+    
+    Args:
+        team_id: Team ObjectId
+        current_user: Current authenticated user
+        membership: Current user's membership in the team
+        
+    Returns:
+        Dictionary with MongoDB filter criteria
+    """
     # Base filter: tasks in this team
-    base_filter = {"team_id": team_obj_id}
+    base_filter = {"team_id": team_id}
     
     # Admin sees all tasks in the team
     if membership["role"] == Role.ADMIN:
         return base_filter
     
-    # Sub-Admin sees tasks of users they manage
+    # Sub-Admin sees tasks of everyone below them, recorded on each task
+    # as the assignee's management chain (manager_ids) and kept in sync
+    # by MembershipService
     if membership["role"] == Role.SUBADMIN:
-        # Find all members managed by this sub-admin
-        managed_memberships = await db[MEMBERSHIPS_COLLECTION].find({
-            "team_id": team_obj_id,
-            "managed_by": current_user["_id"]
-        }).to_list(length=None)
-        
-        managed_user_ids = [m["user_id"] for m in managed_memberships]
-        
-        # Include tasks assigned to managed users
-        base_filter["assigned_to"] = {"$in": managed_user_ids}
+        base_filter["manager_ids"] = current_user["_id"]
         return base_filter
     
     # Member sees only their own tasks
     base_filter["assigned_to"] = current_user["_id"]
     return base_filter
+
+
+def is_task_visible(
+    task: Dict[str, Any],
+    user_id: ObjectId,
+    membership: Dict[str, Any]
+) -> bool:
+    """
+    Decide in memory whether a task is visible to a team member.
+    
+    Applies the same rules as `filter_visible_tasks` to a single task.
+    
+    Args:
+        task: Task document
+        user_id: ObjectId of the current user
+        membership: Current user's membership in the task's team
+        
+    Returns:
+        True if the task is visible to the user
+    """
+    if membership["role"] == Role.ADMIN:
+        return True
+    
+    if membership["role"] == Role.SUBADMIN:
+        return user_id in (task.get("manager_ids") or [])
+    
+    return task["assigned_to"] == user_id
+
+
+async def get_visible_task(
+    task_id: ObjectId,
+    current_user: Dict[str, Any],
+    db
+) -> Dict[str, Any]:
+    """
+    Fetch a task and check that the current user may view it.
+    
+    Reads the task by `_id`; the caller's membership in the task's team
+    comes from the team's permission snapshot.
+    
+    Args:
+        task_id: Task ObjectId
+        current_user: Current authenticated user
+        db: Database instance
+        
+    Returns:
+        Task document
+        
+    Raises:
+        HTTPException 404: If the task does not exist
+        HTTPException 403: If the user cannot view the task
+    """
+    task = await db[TASKS_COLLECTION].find_one({"_id": task_id})
+    
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    
+    membership = await get_user_membership(str(task["team_id"]), current_user, db)
+    
+    if not is_task_visible(task, current_user["_id"], membership):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to view this task"
+        )
+    
+    return task
+
+
+async def get_user_memberships(
+    user_ids: List[ObjectId],
+    db
+) -> Dict[ObjectId, Dict[ObjectId, Dict[str, Any]]]:
+    """
+    Load every membership of the given users in a single query.
+    
+    Used by task mutations to fold the permission check into the write
+    filter before the task (and therefore its team) is known.
+    
+    Args:
+        user_ids: User ObjectIds to load memberships for
+        db: Database instance
+        
+    Returns:
+        Mapping of user_id -> team_id -> membership document
+    """
+    memberships = await db[MEMBERSHIPS_COLLECTION].find(
+        {"user_id": {"$in": list(set(user_ids))}, **ACTIVE_MEMBERSHIP_FILTER},
+        {"user_id": 1, "team_id": 1, "role": 1, "managed_by": 1, "ancestors": 1}
+    ).to_list(length=None)
+    
+    by_user: Dict[ObjectId, Dict[ObjectId, Dict[str, Any]]] = {user_id: {} for user_id in user_ids}
+    for membership in memberships:
+        by_user[membership["user_id"]][membership["team_id"]] = membership
+    
+    return by_user
+
+
+def task_update_filter(
+    current_user: Dict[str, Any],
+    memberships: Dict[ObjectId, Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the task filter matching every task the user may update.
+    
+    Mirrors `filter_visible_tasks` across all of the user's teams:
+    admins match any task of their teams, sub-admins tasks of the members
+    below them, and members their own tasks.
+    
+    Args:
+        current_user: Current authenticated user
+        memberships: Current user's memberships keyed by team_id
+        
+    Returns:
+        MongoDB filter, or None if the user cannot update any task
+    """
+    user_id = current_user["_id"]
+    clauses = []
+    
+    admin_teams = [t for t, m in memberships.items() if m["role"] == Role.ADMIN]
+    if admin_teams:
+        clauses.append({"team_id": {"$in": admin_teams}})
+    
+    member_teams = [t for t, m in memberships.items() if m["role"] == Role.MEMBER]
+    if member_teams:
+        clauses.append({"team_id": {"$in": member_teams}, "assigned_to": user_id})
+    
+    subadmin_teams = [t for t, m in memberships.items() if m["role"] == Role.SUBADMIN]
+    if subadmin_teams:
+        clauses.append({"team_id": {"$in": subadmin_teams}, "manager_ids": user_id})
+    
+    if not clauses:
+        return None
+    
+    return {"$or": clauses}
+
+
+def task_assign_filter(
+    memberships: Dict[ObjectId, Dict[str, Any]],
+    assignee_memberships: Dict[ObjectId, Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the task filter matching every task the user may reassign.
+    
+    A task can be reassigned by an Admin or Sub-Admin of its team, and
+    only to a user who is a member of that team.
+    
+    Args:
+        memberships: Current user's memberships keyed by team_id
+        assignee_memberships: New assignee's memberships keyed by team_id
+        
+    Returns:
+        MongoDB filter, or None if no task can be reassigned
+    """
+    team_ids = [
+        team_id for team_id, m in memberships.items()
+        if m["role"] in [Role.ADMIN, Role.SUBADMIN] and team_id in assignee_memberships
+    ]
+    
+    if not team_ids:
+        return None
+    
+    return {"team_id": {"$in": team_ids}}
+
+
+def task_delete_filter(
+    current_user: Dict[str, Any],
+    memberships: Dict[ObjectId, Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the task filter matching every task the user may delete.
+    
+    Admins can delete any task of their teams; other members only the
+    tasks they created.
+    
+    Args:
+        current_user: Current authenticated user
+        memberships: Current user's memberships keyed by team_id
+        
+    Returns:
+        MongoDB filter, or None if the user cannot delete any task
+    """
+    if not memberships:
+        return None
+    
+    clauses = [{"team_id": {"$in": list(memberships)}, "created_by": current_user["_id"]}]
+    
+    admin_teams = [t for t, m in memberships.items() if m["role"] == Role.ADMIN]
+    if admin_teams:
+        clauses.append({"team_id": {"$in": admin_teams}})
+    
+    return {"$or": clauses}
+
+
+def visibility_scope(current_user: Dict[str, Any], membership: Dict[str, Any]) -> str:
+    """
+    Identify the set of tasks a member can see, for cache keys and ETags.
+    
+    Admins share one scope per team; Sub-Admins and Members each have
+    their own.
+    
+    Args:
+        current_user: Current authenticated user
+        membership: Current user's membership in the team
+        
+    Returns:
+        Scope string
+    """
+    if membership["role"] == Role.ADMIN:
+        return Role.ADMIN.value
+    
+    return f"{membership['role']}:{current_user['_id']}"
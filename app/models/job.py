@@ -0,0 +1,71 @@
+"""
+Background job model for MongoDB.
+Tracks long-running work (such as team deletion) and its progress.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+from bson import ObjectId
+from enum import Enum
+
+
+class JobType(str, Enum):
+    """Kinds of background jobs."""
+    TEAM_DELETE = "team_delete"
+
+
+class JobStatus(str, Enum):
+    """Background job states."""
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+
+
+class JobModel:
+    """
+    Job document structure for MongoDB.
+    
+    Fields:
+        _id: ObjectId (auto-generated by MongoDB); returned as the job id
+        type: Job type (team_delete)
+        status: Job status (pending, running, done)
+        team_id: Team the job works on
+        created_by: User ID of the user who started the job
+        progress: Counters of work done, e.g. documents deleted per collection
+        lease_expires_at: Until when a worker holds the job; another worker
+            may take it over afterwards
+        created_at: Creation timestamp
+        updated_at: Last progress timestamp
+        finished_at: Completion timestamp, or None while unfinished
+    """
+    
+    @staticmethod
+    def create_document(
+        job_type: JobType,
+        team_id: ObjectId,
+        created_by: ObjectId,
+        progress: Optional[Dict[str, int]] = None
+    ) -> dict:
+        """
+        Create a new job document for insertion into MongoDB.
+        
+        Args:
+            job_type: Kind of job
+            team_id: ObjectId of the team the job works on
+            created_by: ObjectId of the user starting the job
+            progress: Initial progress counters
+        
+        Returns:
+            Dictionary representing the job document
+        """
+        now = datetime.utcnow()
+        return {
+            "type": job_type.value,
+            "status": JobStatus.PENDING.value,
+            "team_id": team_id,
+            "created_by": created_by,
+            "progress": progress or {},
+            "lease_expires_at": None,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None
+        }
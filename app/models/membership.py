@@ -3,7 +3,7 @@ Membership model for MongoDB.
 Represents user-team relationships with roles.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from bson import ObjectId
 from enum import Enum
 
@@ -15,6 +15,10 @@ class Role(str, Enum):
     MEMBER = "member"
 
 
+# Matches memberships of teams that are not being deleted
+ACTIVE_MEMBERSHIP_FILTER = {"team_deleting": {"$ne": True}}
+
+
 class MembershipModel:
     """
     Membership document structure for MongoDB.
@@ -25,21 +29,41 @@ class MembershipModel:
         team_id: Reference to Team ObjectId
         role: User's role in the team (admin, subadmin, member)
         managed_by: Optional ObjectId of Sub-Admin managing this member
+        ancestors: Management chain above this member, nearest first
+            (managed_by, then their manager, and so on)
         joined_at: Timestamp when user joined the team
         
     Business Rules:
         - A user can only have one membership per team (unique constraint)
         - Admin: Full permissions across the team
-        - Sub-Admin: Manages specific members (tracked via managed_by)
+        - Sub-Admin: Manages specific members (tracked via managed_by),
+            and may itself be managed by another Sub-Admin
         - Member: Regular team member, may be managed by a Sub-Admin
+        - A Sub-Admin manages everyone whose ancestors include them
     """
     
+    @staticmethod
+    def chain_below(manager: Optional[Dict[str, Any]]) -> List[ObjectId]:
+        """
+        Build the `ancestors` of a member reporting directly to a manager.
+        
+        Args:
+            manager: Manager's membership document, or None for no manager
+            
+        Returns:
+            The manager followed by the manager's own ancestors
+        """
+        if manager is None:
+            return []
+        return [manager["user_id"]] + manager.get("ancestors", [])
+    
     @staticmethod
     def create_document(
         user_id: ObjectId,
         team_id: ObjectId,
         role: Role,
-        managed_by: Optional[ObjectId] = None
+        managed_by: Optional[ObjectId] = None,
+        ancestors: Optional[List[ObjectId]] = None
     ) -> dict:
         """
         Create a new membership document for insertion into MongoDB.
@@ -49,14 +73,19 @@ class MembershipModel:
             team_id: ObjectId of the team
             role: User's role in the team
             managed_by: Optional ObjectId of Sub-Admin managing this member
+            ancestors: Management chain (see `chain_below`); defaults to
+                just `managed_by`
             
         Returns:
             Dictionary representing the membership document
         """
+        if ancestors is None:
+            ancestors = [managed_by] if managed_by is not None else []
         return {
             "user_id": user_id,
             "team_id": team_id,
             "role": role.value,
             "managed_by": managed_by,
+            "ancestors": ancestors,
             "joined_at": datetime.utcnow()
         }
@@ -3,6 +3,7 @@ Task model for MongoDB.
 Represents tasks/work items in the system.
 """
 from datetime import datetime
+from typing import List, Optional
 from bson import ObjectId
 from enum import Enum
 
@@ -28,16 +29,32 @@ class TaskModel:
     Fields:
         _id: ObjectId (auto-generated by MongoDB)
         title: Task title
+        title_key: Normalized title used for prefix search (see `title_key`)
         description: Task details/description
         team_id: Reference to Team ObjectId
         assigned_to: ObjectId of user assigned to this task
         created_by: ObjectId of user who created the task
+        manager_ids: ObjectIds of every Sub-Admin above the assignee
+            (denormalized from the assignee's membership `ancestors`)
         status: Task status (todo, in_progress, done)
         priority: Task priority (low, medium, high)
         created_at: Creation timestamp
         updated_at: Last update timestamp
     """
     
+    @staticmethod
+    def title_key(text: str) -> str:
+        """
+        Normalize a title (or search prefix) for case-insensitive prefix matching.
+        
+        Args:
+            text: Title or prefix typed by the user
+            
+        Returns:
+            Case-folded text with runs of whitespace collapsed
+        """
+        return " ".join(text.casefold().split())
+    
     @staticmethod
     def create_document(
         title: str,
@@ -46,7 +63,8 @@ class TaskModel:
         created_by: ObjectId,
         description: str = "",
         status: TaskStatus = TaskStatus.TODO,
-        priority: TaskPriority = TaskPriority.MEDIUM
+        priority: TaskPriority = TaskPriority.MEDIUM,
+        manager_ids: Optional[List[ObjectId]] = None
     ) -> dict:
         """
         Create a new task document for insertion into MongoDB.
@@ -59,6 +77,7 @@ class TaskModel:
             description: Optional task description
             status: Initial task status
             priority: Task priority level
+            manager_ids: Management chain of the assignee, if any
             
         Returns:
             Dictionary representing the task document
@@ -66,12 +85,52 @@ class TaskModel:
         now = datetime.utcnow()
         return {
             "title": title,
+            "title_key": TaskModel.title_key(title),
             "description": description,
             "team_id": team_id,
             "assigned_to": assigned_to,
             "created_by": created_by,
+            "manager_ids": manager_ids or [],
             "status": status.value,
             "priority": priority.value,
             "created_at": now,
             "updated_at": now
         }
+
+
+class TaskTombstoneModel:
+    """
+    Record of a task that was deleted or left some users' visibility, kept
+    so delta sync can report its removal.
+    
+    Fields:
+        _id: ObjectId of the tombstone
+        task_id: ObjectId of the removed task
+        team_id: Reference to Team ObjectId
+        assigned_to: Assignee before the removal (for visibility filtering)
+        manager_ids: Management chain of that assignee (for visibility
+            filtering)
+        deleted_at: Removal timestamp; tombstones expire after
+            TASK_TOMBSTONE_TTL_SECONDS
+    """
+    
+    @staticmethod
+    def create_document(task: dict) -> dict:
+        """
+        Create the tombstone of a removed task.
+        
+        Args:
+            task: Task document as it was before the removal (`_id`,
+                `team_id`, `assigned_to` and `manager_ids` are enough)
+            
+        Returns:
+            Dictionary representing the tombstone document
+        """
+        return {
+            "_id": ObjectId(),
+            "task_id": task["_id"],
+            "team_id": task["team_id"],
+            "assigned_to": task["assigned_to"],
+            "manager_ids": task.get("manager_ids") or [],
+            "deleted_at": datetime.utcnow()
+        }
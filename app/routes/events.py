@@ -0,0 +1,112 @@
+"""
+Team event stream API routes.
+Pushes task and membership changes to clients over Server-Sent Events.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.core import events
+from app.core.config import settings
+from app.core.serialization import DocumentSerializer, dumps
+from app.dependencies.auth import get_current_user
+from app.dependencies.rbac import require_team_member, get_user_membership, is_task_visible
+from app.db.mongodb import get_database
+from app.schemas.task import TaskResponse
+from app.schemas.membership import MembershipResponse
+
+
+router = APIRouter(prefix="/teams/{team_id}/events", tags=["Events"])
+
+task_serializer = DocumentSerializer(TaskResponse)
+membership_serializer = DocumentSerializer(MembershipResponse)
+
+
+@router.get("")
+async def stream_events(
+    team_id: str,
+    request: Request,
+    current_user = Depends(get_current_user),
+    membership = Depends(require_team_member),
+    db = Depends(get_database)
+):
+    """
+    Stream the team's task and membership changes as Server-Sent Events.
+    
+    Requires: Team membership.
+    
+    Event types: `task.created`, `task.updated`, `task.assigned`,
+    `task.deleted`, `membership.added`, `membership.updated`,
+    `membership.removed`, `team.deleted` and `resync`.
+    
+    Task events follow the task list visibility rules; a task that moves
+    out of the caller's scope is still reported once so the client can
+    drop it. Membership events go to every member. A `resync` event means
+    events were dropped because the client fell behind, and lists should
+    be refetched. The stream ends when the caller leaves the team or the
+    team is deleted.
+    """
+    user_id = current_user["_id"]
+    scope = {"membership": membership}
+    
+    def accepts(event: Dict[str, Any]) -> bool:
+        """Apply the caller's current task visibility to an event."""
+        if not event["type"].startswith("task."):
+            return True
+        return any(
+            is_task_visible(task, user_id, scope["membership"])
+            for task in (event["task"], event.get("previous"))
+            if task is not None
+        )
+    
+    subscription = events.event_hub.subscribe(membership["team_id"], accepts)
+    
+    async def body() -> AsyncIterator[str]:
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), settings.EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                
+                yield _format_event(event)
+                
+                if event["type"] == events.TEAM_DELETED:
+                    return
+                
+                # The caller's own role or membership changed
+                changed = event.get("membership")
+                if changed is not None and changed["user_id"] == user_id:
+                    try:
+                        scope["membership"] = await get_user_membership(team_id, current_user, db)
+                    except HTTPException:
+                        return
+        finally:
+            events.event_hub.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _format_event(event: Dict[str, Any]) -> str:
+    """Render a hub event as an SSE message."""
+    if event["type"] == events.TASK_DELETED:
+        data = {"task_id": event["task"]["_id"]}
+    elif "task" in event:
+        data = {"task": task_serializer.one(event["task"])}
+    elif "membership" in event:
+        data = {"membership": membership_serializer.one(event["membership"])}
+    else:
+        data = {}
+    data["team_id"] = event["team_id"]
+    
+    return f"event: {event['type']}\nid: {event['id']}\ndata: {dumps(data).decode()}\n\n"
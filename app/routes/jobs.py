@@ -0,0 +1,51 @@
+"""
+Background job API routes.
+Reports the progress of long-running operations such as team deletion.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from bson import ObjectId
+
+from app.schemas.job import JobResponse
+from app.services.team_deletion_service import TeamDeletionService
+from app.dependencies.auth import get_current_user
+from app.db.mongodb import get_database
+from app.core.serialization import DocumentSerializer
+
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+# Renders job documents in the JobResponse shape without re-validation
+job_serializer = DocumentSerializer(JobResponse)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    current_user = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """
+    Get the status and progress of a background job.
+    
+    Requires: Being the user who started the job.
+    
+    `progress` counts the documents processed so far per collection.
+    """
+    try:
+        job_obj_id = ObjectId(job_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid job ID format"
+        )
+    
+    job = await TeamDeletionService.get_job(db, job_obj_id)
+    
+    # Other users' jobs are reported as missing
+    if not job or job["created_by"] != current_user["_id"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return job_serializer.response(job)
@@ -0,0 +1,90 @@
+"""
+Current user API routes.
+Serves views of the caller's own data across all of their teams.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional
+
+from app.schemas.task import TaskResponse
+from app.services.task_service import TaskService
+from app.dependencies.auth import get_current_user
+from app.dependencies.rbac import get_user_memberships
+from app.db.mongodb import get_database
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
+from app.core.fields import response_fields, parse_fields, partial_response
+from app.core.serialization import DocumentSerializer
+from app.models.task import TaskStatus
+
+
+router = APIRouter(prefix="/me", tags=["Me"])
+
+# Field names accepted by the `fields` query parameter
+TASK_RESPONSE_FIELDS = response_fields(TaskResponse)
+
+# Renders service documents in the TaskResponse shape without re-validation
+task_serializer = DocumentSerializer(TaskResponse)
+
+# Keyset sort fields encoded in the inbox cursor
+INBOX_CURSOR_KEYS = ("updated_at", "_id")
+
+
+@router.get("/tasks", response_model=List[TaskResponse])
+async def list_my_tasks(
+    task_status: Optional[List[TaskStatus]] = Query(None, alias="status", description="Only tasks with these statuses (repeatable)"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return, e.g. title,status,team_name"),
+    current_user = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """
+    List the tasks assigned to the current user across all of their teams.
+    
+    Tasks are returned most recently updated first, with team and user
+    names populated. Tasks in teams the user has left are not included.
+    
+    Query parameters:
+    - status: Filter by status; repeat for several, e.g.
+      `status=todo&status=in_progress`
+    - limit: Maximum records to return (1-100)
+    - cursor: Opaque cursor for keyset pagination
+    - fields: Sparse fieldset; only these fields (plus `_id`) are fetched
+      and returned, and names are only populated when requested
+    
+    When more tasks may follow, the `X-Next-Cursor` response header
+    carries the cursor for the next page.
+    """
+    try:
+        after = decode_cursor(cursor, INBOX_CURSOR_KEYS) if cursor else None
+        requested_fields = parse_fields(fields, TASK_RESPONSE_FIELDS)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    user_id = current_user["_id"]
+    memberships = await get_user_memberships([user_id], db)
+    team_ids = list(memberships[user_id])
+    
+    tasks = []
+    if team_ids:
+        tasks = await TaskService.list_assigned_tasks(
+            db,
+            user_id,
+            team_ids,
+            statuses=task_status,
+            limit=limit,
+            after=after,
+            fields=requested_fields
+        )
+    
+    headers = {}
+    next_page = next_cursor(tasks, limit, INBOX_CURSOR_KEYS)
+    if next_page:
+        headers[NEXT_CURSOR_HEADER] = next_page
+    
+    if requested_fields:
+        return partial_response(tasks, requested_fields, headers)
+    
+    return task_serializer.response(tasks, headers=headers)
@@ -2,20 +2,35 @@
 Membership management API routes.
 Handles adding/removing team members and role management.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Header, Request, Response, UploadFile, status, Query
+from fastapi.responses import StreamingResponse
 from bson import ObjectId
-from typing import List
+from typing import AsyncIterator, Iterable, List, Optional
+import csv
+import io
+import json
 
-from app.schemas.membership import MembershipCreate, MembershipUpdate, MembershipResponse
+from app.schemas.membership import MembershipCreate, MembershipUpdate, MembershipResponse, MembershipImport
 from app.services.membership_service import MembershipService
+from app.services.team_version_service import TeamVersionService
 from app.dependencies.auth import get_current_user
 from app.dependencies.rbac import require_team_admin, require_team_member, can_manage_user
 from app.db.mongodb import get_database
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
+from app.core.fields import response_fields, parse_fields, partial_response
+from app.core.serialization import DocumentSerializer
+from app.core.etag import ETAG_HEADER, make_etag, etag_matches
 from app.models.membership import Role
 
 
 router = APIRouter(prefix="/teams/{team_id}/members", tags=["Memberships"])
 
+# Field names accepted by the `fields` query parameter
+MEMBERSHIP_RESPONSE_FIELDS = response_fields(MembershipResponse)
+
+# Renders service documents in the MembershipResponse shape without re-validation
+membership_serializer = DocumentSerializer(MembershipResponse)
+
 
 @router.post("", response_model=MembershipResponse, status_code=status.HTTP_201_CREATED)
 async def add_member(
@@ -51,14 +66,7 @@ async def add_member(
             managed_by=managed_by_obj_id
         )
         
-        # Convert ObjectIds to strings
-        new_membership["_id"] = str(new_membership["_id"])
-        new_membership["user_id"] = str(new_membership["user_id"])
-        new_membership["team_id"] = str(new_membership["team_id"])
-        if new_membership.get("managed_by"):
-            new_membership["managed_by"] = str(new_membership["managed_by"])
-        
-        return new_membership
+        return membership_serializer.response(new_membership, status_code=status.HTTP_201_CREATED)
         
     except ValueError as e:
         raise HTTPException(
@@ -67,36 +75,150 @@ async def add_member(
         )
 
 
+@router.post("/import")
+async def import_members(
+    team_id: str,
+    import_data: MembershipImport,
+    membership = Depends(require_team_admin),
+    db = Depends(get_database)
+):
+    """
+    Add many members to the team from a JSON array.
+    
+    Requires: Admin role in the team.
+    
+    Each row names the user by `user_id` or `email`; `managed_by` may be
+    a user ID or an email. Streams back an NDJSON report with one line
+    per row: `{"row", "status": "created" | "failed", "user_id", "detail"}`.
+    """
+    rows = [row.model_dump(mode="json") for row in import_data.members]
+    return _import_response(db, membership["team_id"], rows)
+
+
+@router.post("/import/csv")
+async def import_members_csv(
+    team_id: str,
+    file: UploadFile = File(..., description="CSV with user_id or email, role and managed_by columns"),
+    membership = Depends(require_team_admin),
+    db = Depends(get_database)
+):
+    """
+    Add many members to the team from an uploaded CSV file.
+    
+    Requires: Admin role in the team.
+    
+    The header row must include a `user_id` or `email` column; `role`
+    (default member) and `managed_by` are optional. Rows are numbered
+    from 1 after the header. Streams back the same NDJSON report as the
+    JSON import.
+    """
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV file must be UTF-8 encoded"
+        )
+    
+    reader = csv.DictReader(io.StringIO(text))
+    columns = {name.strip() for name in reader.fieldnames or []}
+    if not columns & {"user_id", "email"}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV must have a user_id or email column"
+        )
+    
+    rows = (
+        {(key or "").strip(): (value or "").strip() for key, value in row.items() if isinstance(value, str)}
+        for row in reader
+    )
+    return _import_response(db, membership["team_id"], rows)
+
+
+def _import_response(db, team_id: ObjectId, rows: Iterable[dict]) -> StreamingResponse:
+    """Stream the per-row import report as NDJSON, one chunk per batch."""
+    async def body() -> AsyncIterator[str]:
+        async for reports in MembershipService.import_members(db, team_id, rows):
+            yield "".join(json.dumps(report) + "\n" for report in reports)
+    
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
 @router.get("", response_model=List[MembershipResponse])
 async def list_members(
     team_id: str,
+    request: Request,
+    role: Optional[Role] = Query(None, description="Only members with this role"),
+    managed_by: Optional[str] = Query(None, description="Only members managed by this Sub-Admin"),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return, e.g. user_id,role"),
+    if_none_match: Optional[str] = Header(None),
     membership = Depends(require_team_member),
     db = Depends(get_database)
 ):
     """
-    List all members of the team.
+    List the members of the team, one page at a time.
     
     Requires: Team membership (any role).
+    
+    Query parameters:
+    - role: Filter by role
+    - managed_by: Filter by managing Sub-Admin (user ID)
+    - limit: Maximum records to return (1-100)
+    - cursor: Opaque cursor for keyset pagination
+    - fields: Sparse fieldset; only these fields (plus `_id`) are
+      returned, and user details are only looked up when `user_email`
+      or `user_full_name` is requested
+    
+    When more members may follow, the `X-Next-Cursor` response header
+    carries the cursor for the next page.
+    
+    Responses carry an `ETag` derived from the team's version and the
+    query; a matching `If-None-Match` gets a 304 without listing members.
     """
     try:
         team_obj_id = ObjectId(team_id)
+        managed_by_obj_id = ObjectId(managed_by) if managed_by else None
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid team ID format"
+            detail="Invalid ID format"
         )
     
-    members = await MembershipService.get_team_members(db, team_obj_id)
+    try:
+        after = decode_cursor(cursor)["_id"] if cursor else None
+        requested_fields = parse_fields(fields, MEMBERSHIP_RESPONSE_FIELDS)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    # Convert ObjectIds to strings
-    for member in members:
-        member["_id"] = str(member["_id"])
-        member["user_id"] = str(member["user_id"])
-        member["team_id"] = str(member["team_id"])
-        if member.get("managed_by"):
-            member["managed_by"] = str(member["managed_by"])
+    version = await TeamVersionService.get_version(db, team_obj_id)
+    etag = make_etag(team_id, version, request.url.query)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
     
-    return members
+    members = await MembershipService.get_team_members(
+        db,
+        team_obj_id,
+        requested_fields,
+        role=role,
+        managed_by=managed_by_obj_id,
+        limit=limit,
+        after=after
+    )
+    
+    headers = {ETAG_HEADER: etag}
+    next_page = next_cursor(members, limit)
+    if next_page:
+        headers[NEXT_CURSOR_HEADER] = next_page
+    
+    if requested_fields:
+        return partial_response(members, requested_fields, headers)
+    
+    return membership_serializer.response(members, headers=headers)
 
 
 @router.put("/{user_id}", response_model=MembershipResponse)
@@ -111,6 +233,9 @@ async def update_member_role(
     Update a member's role in the team.
     
     Requires: Admin role in the team.
+    
+    A new `managed_by` moves the member together with everyone they
+    manage; it cannot be the member or someone below them.
     """
     try:
         team_obj_id = ObjectId(team_id)
@@ -122,13 +247,19 @@ async def update_member_role(
             detail="Invalid ID format"
         )
     
-    updated_membership = await MembershipService.update_member_role(
-        db,
-        user_id=user_obj_id,
-        team_id=team_obj_id,
-        new_role=update_data.role,
-        managed_by=managed_by_obj_id
-    )
+    try:
+        updated_membership = await MembershipService.update_member_role(
+            db,
+            user_id=user_obj_id,
+            team_id=team_obj_id,
+            new_role=update_data.role,
+            managed_by=managed_by_obj_id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     if not updated_membership:
         raise HTTPException(
@@ -136,14 +267,7 @@ async def update_member_role(
             detail="Membership not found"
         )
     
-    # Convert ObjectIds to strings
-    updated_membership["_id"] = str(updated_membership["_id"])
-    updated_membership["user_id"] = str(updated_membership["user_id"])
-    updated_membership["team_id"] = str(updated_membership["team_id"])
-    if updated_membership.get("managed_by"):
-        updated_membership["managed_by"] = str(updated_membership["managed_by"])
-    
-    return updated_membership
+    return membership_serializer.response(updated_membership)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -158,7 +282,10 @@ async def remove_member(
     
     Requires:
     - Admin: Can remove anyone
-    - Sub-Admin: Can remove members they manage
+    - Sub-Admin: Can remove members below them
+    
+    Anyone the removed member managed moves up to the removed member's
+    own manager.
     """
     try:
         team_obj_id = ObjectId(team_id)
@@ -172,7 +299,13 @@ async def remove_member(
     # Check if current user can manage the target user
     await can_manage_user(team_id, user_id, current_user, db)
     
-    removed = await MembershipService.remove_member(db, user_obj_id, team_obj_id)
+    try:
+        removed = await MembershipService.remove_member(db, user_obj_id, team_obj_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     if not removed:
         raise HTTPException(
@@ -2,20 +2,62 @@
 Task management API routes.
 Handles task CRUD operations with RBAC-based visibility filtering.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
 from bson import ObjectId
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import csv
+import io
+import json
 
-from app.schemas.task import TaskCreate, TaskUpdate, TaskAssign, TaskResponse
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskAssign,
+    TaskResponse,
+    TaskChangesResponse,
+    TaskExportFormat,
+    TaskSearchMode,
+    TaskBulkCreate,
+    TaskBulkUpdate,
+    TaskBulkResponse,
+    BulkItemResult,
+)
 from app.services.task_service import TaskService
+from app.services.team_version_service import TeamVersionService
 from app.dependencies.auth import get_current_user
-from app.dependencies.rbac import require_team_member, filter_visible_tasks
+from app.dependencies.rbac import (
+    require_team_member,
+    get_user_membership,
+    filter_visible_tasks,
+    build_visible_tasks_filter,
+    visibility_scope,
+    get_visible_task,
+    get_user_memberships,
+    task_update_filter,
+    task_assign_filter,
+    task_delete_filter,
+)
 from app.db.mongodb import get_database
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor, next_cursor
+from app.core.fields import response_fields, parse_fields, partial_response
+from app.core.serialization import BSONJSONResponse, DocumentSerializer
+from app.core.etag import ETAG_HEADER, make_etag, etag_matches
 from app.models.membership import Role
+from app.models.task import TaskModel
+from app.db.collections import TASK_TOMBSTONE_TTL_SECONDS
 
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+# Field names accepted by the `fields` query parameter
+TASK_RESPONSE_FIELDS = response_fields(TaskResponse)
+
+# Renders service documents in the TaskResponse shape without re-validation
+task_serializer = DocumentSerializer(TaskResponse)
+
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
@@ -54,13 +96,7 @@ async def create_task(
             priority=task_data.priority
         )
         
-        # Convert ObjectIds to strings
-        task["_id"] = str(task["_id"])
-        task["team_id"] = str(task["team_id"])
-        task["assigned_to"] = str(task["assigned_to"])
-        task["created_by"] = str(task["created_by"])
-        
-        return task
+        return task_serializer.response(task, status_code=status.HTTP_201_CREATED)
         
     except ValueError as e:
         raise HTTPException(
@@ -69,11 +105,175 @@ async def create_task(
         )
 
 
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def create_tasks_bulk(
+    bulk_data: TaskBulkCreate,
+    current_user = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """
+    Create many tasks in one request (e.g. instantiating a template).
+    
+    Each item follows the rules of `POST /tasks`: the caller must be a
+    member of the item's team and the assignee a member of that team.
+    The caller's and every assignee's memberships are loaded with one
+    query and the valid items are inserted in unordered batches.
+    
+    Returns one result per item, in request order: 201 with the new task
+    id, or the status code and detail the single-task endpoint would give.
+    """
+    results: List[Optional[BulkItemResult]] = [None] * len(bulk_data.tasks)
+    items = []
+    for index, item in enumerate(bulk_data.tasks):
+        try:
+            items.append((index, item, ObjectId(item.team_id), ObjectId(item.assigned_to)))
+        except Exception:
+            results[index] = BulkItemResult(
+                index=index, status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid ID format"
+            )
+    
+    # Caller's and all assignees' memberships in one $in query
+    memberships = await get_user_memberships(
+        [current_user["_id"]] + [assigned_to for _, _, _, assigned_to in items], db
+    )
+    caller_memberships = memberships[current_user["_id"]]
+    
+    positions, task_docs = [], []
+    for index, item, team_id, assigned_to in items:
+        if team_id not in caller_memberships:
+            results[index] = BulkItemResult(
+                index=index, status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this team"
+            )
+            continue
+        
+        assignee_membership = memberships[assigned_to].get(team_id)
+        if not assignee_membership:
+            results[index] = BulkItemResult(
+                index=index, status_code=status.HTTP_400_BAD_REQUEST, detail="Assigned user is not a member of this team"
+            )
+            continue
+        
+        positions.append(index)
+        task_docs.append(TaskModel.create_document(
+            title=item.title,
+            team_id=team_id,
+            assigned_to=assigned_to,
+            created_by=current_user["_id"],
+            description=item.description,
+            status=item.status,
+            priority=item.priority,
+            manager_ids=assignee_membership.get("ancestors")
+        ))
+    
+    errors = await TaskService.create_tasks(db, task_docs) if task_docs else []
+    for index, task_doc, error in zip(positions, task_docs, errors):
+        if error is None:
+            results[index] = BulkItemResult(
+                index=index, status_code=status.HTTP_201_CREATED, id=str(task_doc["_id"])
+            )
+        else:
+            results[index] = BulkItemResult(
+                index=index, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error
+            )
+    
+    return bulk_response(results)
+
+
+@router.patch("/bulk", response_model=TaskBulkResponse)
+async def update_tasks_bulk(
+    bulk_data: TaskBulkUpdate,
+    current_user = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """
+    Update many tasks in one request (e.g. mass status changes).
+    
+    Each item follows the rules of `PUT /tasks/{task_id}`. The permission
+    filter is built once from the caller's memberships and the updates
+    are written concurrently in batches.
+    
+    Returns one result per item, in request order: 200 when updated,
+    404 for unknown tasks and 403 for tasks the caller may not update.
+    """
+    results: List[Optional[BulkItemResult]] = [None] * len(bulk_data.tasks)
+    updates = []
+    for index, item in enumerate(bulk_data.tasks):
+        try:
+            task_id = ObjectId(item.id)
+        except Exception:
+            results[index] = BulkItemResult(
+                index=index, status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid task ID format"
+            )
+            continue
+        updates.append((index, task_id, TaskService.build_update(
+            title=item.title,
+            description=item.description,
+            status=item.status,
+            priority=item.priority
+        )))
+    
+    # Permission predicate: tasks visible to the user across their teams
+    memberships = await get_user_memberships([current_user["_id"]], db)
+    task_filter = task_update_filter(current_user, memberships[current_user["_id"]])
+    
+    applied = [False] * len(updates)
+    if task_filter and updates:
+        applied = await TaskService.update_tasks(
+            db,
+            [(task_id, update_data) for _, task_id, update_data in updates],
+            filter_criteria=task_filter
+        )
+    
+    # Follow-up read only to tell missing tasks from forbidden ones
+    existing = await TaskService.find_existing_ids(
+        db, list({task_id for (_, task_id, _), matched in zip(updates, applied) if not matched})
+    )
+    
+    for (index, task_id, _), matched in zip(updates, applied):
+        if matched:
+            results[index] = BulkItemResult(index=index, status_code=status.HTTP_200_OK, id=str(task_id))
+        elif task_id in existing:
+            results[index] = BulkItemResult(
+                index=index,
+                status_code=status.HTTP_403_FORBIDDEN,
+                id=str(task_id),
+                detail="You don't have permission to update this task"
+            )
+        else:
+            results[index] = BulkItemResult(
+                index=index, status_code=status.HTTP_404_NOT_FOUND, id=str(task_id), detail="Task not found"
+            )
+    
+    return bulk_response(results)
+
+
+def bulk_response(results: List[BulkItemResult]) -> TaskBulkResponse:
+    """
+    Summarize per-item bulk results.
+    
+    Args:
+        results: One result per request item, in request order
+        
+    Returns:
+        TaskBulkResponse with success and failure counts
+    """
+    succeeded = sum(1 for result in results if result.status_code < 400)
+    return TaskBulkResponse(
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
+
+
 @router.get("", response_model=List[TaskResponse])
 async def list_tasks(
     team_id: str,
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return, e.g. title,status,assigned_to"),
+    if_none_match: Optional[str] = Header(None),
     current_user = Depends(get_current_user),
     db = Depends(get_database)
 ):
@@ -87,72 +287,293 @@ async def list_tasks(
     
     Query parameters:
     - team_id: Filter by team (required)
-    - skip: Number of records to skip (pagination)
+    - skip: Number of records to skip (offset pagination, ignored with cursor)
     - limit: Maximum records to return (1-100)
+    - cursor: Opaque cursor for keyset pagination
+    - fields: Sparse fieldset; only these fields (plus `_id`) are fetched
+      and returned, and names are only populated when requested
+    
+    When more tasks may follow, the `X-Next-Cursor` response header
+    carries the cursor for the next page.
+    
+    Responses carry an `ETag` derived from the team's version, the
+    caller's visibility scope and the query; a matching `If-None-Match`
+    gets a 304 without running the list query.
     """
-    # Get RBAC filter for visible tasks
-    task_filter = await filter_visible_tasks(team_id, current_user, db)
+    try:
+        team_obj_id = ObjectId(team_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid team ID format"
+        )
+    
+    try:
+        after = decode_cursor(cursor)["_id"] if cursor else None
+        requested_fields = parse_fields(fields, TASK_RESPONSE_FIELDS)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    # Membership check and team version lookup in one concurrent round trip
+    membership, version = await asyncio.gather(
+        get_user_membership(team_id, current_user, db),
+        TeamVersionService.get_version(db, team_obj_id)
+    )
+    
+    etag = make_etag(team_id, version, visibility_scope(current_user, membership), request.url.query)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
     
-    tasks = await TaskService.list_tasks(db, task_filter, skip, limit)
+    # RBAC filter for visible tasks
+    task_filter = build_visible_tasks_filter(team_obj_id, current_user, membership)
+    
+    tasks = await TaskService.list_tasks(
+        db, task_filter, skip, limit, after=after, fields=requested_fields
+    )
     
-    # Convert ObjectIds to strings
-    for task in tasks:
-        task["_id"] = str(task["_id"])
-        task["team_id"] = str(task["team_id"])
-        task["assigned_to"] = str(task["assigned_to"])
-        task["created_by"] = str(task["created_by"])
+    headers = {ETAG_HEADER: etag}
+    next_page = next_cursor(tasks, limit)
+    if next_page:
+        headers[NEXT_CURSOR_HEADER] = next_page
     
-    return tasks
+    if requested_fields:
+        return partial_response(tasks, requested_fields, headers)
+    
+    return task_serializer.response(tasks, headers=headers)
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(
-    task_id: str,
+# Columns written by the task export, in order
+EXPORT_FIELDS = [
+    "_id", "title", "description", "team_id", "assigned_to", "created_by",
+    "status", "priority", "created_at", "updated_at",
+    "assigned_to_name", "created_by_name", "team_name",
+]
+
+
+def _export_value(value: Any) -> Any:
+    """Convert a BSON value to a plain JSON/CSV value."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def _export_ndjson(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[str]:
+    """Render task batches as newline-delimited JSON, one chunk per batch."""
+    async for batch in batches:
+        yield "".join(
+            json.dumps({field: _export_value(task.get(field)) for field in EXPORT_FIELDS}) + "\n"
+            for task in batch
+        )
+
+
+async def _export_csv(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[str]:
+    """Render task batches as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    
+    async for batch in batches:
+        for task in batch:
+            writer.writerow([_export_value(task.get(field)) for field in EXPORT_FIELDS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    # Header only, when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/export")
+async def export_tasks(
+    team_id: str,
+    format: TaskExportFormat = Query(TaskExportFormat.NDJSON),
     current_user = Depends(get_current_user),
     db = Depends(get_database)
 ):
     """
-    Get task details.
+    Export every visible task of a team as NDJSON or CSV.
     
-    Visibility check: User can only view tasks they have access to based on their role.
+    Applies the same visibility rules as the task list. The response is
+    streamed from a single database cursor in batches, so exports of any
+    size run in one request at steady memory.
+    """
+    # Resolve the RBAC filter before the response starts streaming
+    task_filter = await filter_visible_tasks(team_id, current_user, db)
+    batches = TaskService.iter_task_batches(db, task_filter)
+    
+    if format == TaskExportFormat.CSV:
+        body, media_type = _export_csv(batches), "text/csv"
+    else:
+        body, media_type = _export_ndjson(batches), "application/x-ndjson"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks-{team_id}.{format.value}"'}
+    )
+
+
+# Keyset sort fields encoded in the search cursor, per mode
+SEARCH_CURSOR_KEYS = {
+    TaskSearchMode.TEXT: ("score", "_id"),
+    TaskSearchMode.PREFIX: ("title_key", "_id"),
+}
+
+
+@router.get("/search", response_model=List[TaskResponse])
+async def search_tasks(
+    team_id: str,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms, or the title prefix in prefix mode"),
+    mode: TaskSearchMode = Query(TaskSearchMode.TEXT),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return, e.g. title,status"),
+    current_user = Depends(get_current_user),
+    db = Depends(get_database)
+):
     """
+    Search the visible tasks of a team.
+    
+    Applies the same visibility rules as the task list.
+    
+    Modes:
+    - **text**: Full-text search over title and description, best
+      matches first (title matches rank higher)
+    - **prefix**: Case-insensitive title prefix match in title order,
+      for type-ahead
+    
+    When more results may follow, the `X-Next-Cursor` response header
+    carries the cursor for the next page; it is only valid for the same
+    `q` and `mode`.
+    """
+    keys = SEARCH_CURSOR_KEYS[mode]
     try:
-        task_obj_id = ObjectId(task_id)
-    except Exception:
+        after = decode_cursor(cursor, keys) if cursor else None
+        requested_fields = parse_fields(fields, TASK_RESPONSE_FIELDS)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid task ID format"
+            detail=str(e)
+        )
+    
+    task_filter = await filter_visible_tasks(team_id, current_user, db)
+    
+    if mode == TaskSearchMode.PREFIX:
+        tasks = await TaskService.prefix_search_tasks(
+            db, task_filter, q, limit, after=after, fields=requested_fields
         )
+    else:
+        tasks = await TaskService.search_tasks(
+            db, task_filter, q, limit, after=after, fields=requested_fields
+        )
+    
+    headers = {}
+    next_page = next_cursor(tasks, limit, keys)
+    if next_page:
+        headers[NEXT_CURSOR_HEADER] = next_page
+    
+    if requested_fields:
+        return partial_response(tasks, requested_fields, headers)
+    
+    return task_serializer.response(tasks, headers=headers)
+
+
+# Sync position fields encoded in the delta sync token
+SYNC_TOKEN_KEYS = ("team_id", "updated_at", "task_id", "deleted_at", "tombstone_id")
+
+
+@router.get("/changes", response_model=TaskChangesResponse)
+async def list_task_changes(
+    team_id: str,
+    since: Optional[str] = Query(None, description="sync_token from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """
+    Get the visible tasks of a team created, updated or deleted since a
+    sync token, for clients that keep a local copy of the task list.
     
-    task = await TaskService.get_task(db, task_obj_id)
+    Applies the same visibility rules as the task list.
     
-    if not task:
+    Without `since`, every visible task is returned (over several calls
+    while `has_more` is true). Each response carries a `sync_token` for the
+    next call; apply `tasks` as upserts and remove the `deleted` ids. The
+    same change may be delivered twice.
+    
+    Deletions are remembered for 7 days; an older token gets a 410 and
+    the client must start over with a full sync. Tasks that leave the
+    caller's visibility (reassignment, management changes) are reported
+    in `deleted` as well.
+    """
+    try:
+        team_obj_id = ObjectId(team_id)
+    except Exception:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid team ID format"
         )
     
-    # Check if user has access to this task
-    team_id_str = str(task["team_id"])
-    task_filter = await filter_visible_tasks(team_id_str, current_user, db)
+    position = None
+    if since:
+        try:
+            position = decode_cursor(since, SYNC_TOKEN_KEYS)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid sync token"
+            )
+        if position.pop("team_id") != team_obj_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Sync token belongs to another team"
+            )
+        if position["deleted_at"] < datetime.utcnow() - timedelta(seconds=TASK_TOMBSTONE_TTL_SECONDS):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Sync token expired; start a full sync"
+            )
     
-    # Verify task matches visibility filter
-    task_filter["_id"] = task_obj_id
-    visible_task = await db.tasks.find_one(task_filter)
+    task_filter = await filter_visible_tasks(team_id, current_user, db)
+    changes = await TaskService.list_changes(db, task_filter, position, limit)
+    
+    return BSONJSONResponse({
+        "tasks": task_serializer.many(changes["tasks"]),
+        "deleted": changes["deleted"],
+        "sync_token": encode_cursor({"team_id": team_obj_id, **changes["position"]}),
+        "has_more": changes["has_more"],
+    })
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: str,
+    current_user = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    """
+    Get task details.
     
-    if not visible_task:
+    Visibility check: User can only view tasks they have access to based on their role.
+    """
+    try:
+        task_obj_id = ObjectId(task_id)
+    except Exception:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view this task"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid task ID format"
         )
     
-    # Convert ObjectIds to strings
-    task["_id"] = str(task["_id"])
-    task["team_id"] = str(task["team_id"])
-    task["assigned_to"] = str(task["assigned_to"])
-    task["created_by"] = str(task["created_by"])
+    # Fetch the task and check visibility in two round trips
+    task = await get_visible_task(task_obj_id, current_user, db)
     
-    return task
+    return task_serializer.response(task)
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
@@ -169,6 +590,9 @@ async def update_task(
     - Task creator can update their tasks
     - Task assignee can update status/priority
     - Team Admin can update any task
+    
+    The permission check is part of the update filter, so the write is a
+    single conditional `find_one_and_update`.
     """
     try:
         task_obj_id = ObjectId(task_id)
@@ -178,45 +602,26 @@ async def update_task(
             detail="Invalid task ID format"
         )
     
-    # Get task
-    task = await TaskService.get_task(db, task_obj_id)
+    # Permission predicate: tasks visible to the user across their teams
+    memberships = await get_user_memberships([current_user["_id"]], db)
+    task_filter = task_update_filter(current_user, memberships[current_user["_id"]])
     
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-    
-    # Check permissions: creator, assignee, or admin can update
-    team_id_str = str(task["team_id"])
-    task_filter = await filter_visible_tasks(team_id_str, current_user, db)
-    task_filter["_id"] = task_obj_id
-    
-    visible_task = await db.tasks.find_one(task_filter)
-    
-    if not visible_task:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to update this task"
+    updated_task = None
+    if task_filter:
+        updated_task = await TaskService.update_task(
+            db,
+            task_obj_id,
+            title=task_data.title,
+            description=task_data.description,
+            status=task_data.status,
+            priority=task_data.priority,
+            filter_criteria=task_filter
         )
     
-    # Update task
-    updated_task = await TaskService.update_task(
-        db,
-        task_obj_id,
-        title=task_data.title,
-        description=task_data.description,
-        status=task_data.status,
-        priority=task_data.priority
-    )
-    
-    # Convert ObjectIds to strings
-    updated_task["_id"] = str(updated_task["_id"])
-    updated_task["team_id"] = str(updated_task["team_id"])
-    updated_task["assigned_to"] = str(updated_task["assigned_to"])
-    updated_task["created_by"] = str(updated_task["created_by"])
+    if not updated_task:
+        await raise_task_write_error(db, task_obj_id, "You don't have permission to update this task")
     
-    return updated_task
+    return task_serializer.response(updated_task)
 
 
 @router.patch("/{task_id}/assign", response_model=TaskResponse)
@@ -240,52 +645,47 @@ async def assign_task(
             detail="Invalid ID format"
         )
     
-    # Get task
-    task = await TaskService.get_task(db, task_obj_id)
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+    # Caller's and new assignee's memberships in one query
+    memberships = await get_user_memberships([current_user["_id"], new_assignee_obj_id], db)
+    caller_memberships = memberships[current_user["_id"]]
+    assignee_memberships = memberships[new_assignee_obj_id]
+    task_filter = task_assign_filter(caller_memberships, assignee_memberships)
     
-    # Only Admin or managing Sub-Admin can reassign
-    team_id_str = str(task["team_id"])
-    membership = await require_team_member(team_id_str, current_user, db)
-    
-    if membership["role"] not in [Role.ADMIN, Role.SUBADMIN]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only Admin or Sub-Admin can reassign tasks"
-        )
-    
-    try:
+    updated_task = None
+    if task_filter:
         updated_task = await TaskService.assign_task(
             db,
             task_obj_id,
             new_assignee_obj_id,
-            ObjectId(team_id_str)
+            filter_criteria=task_filter,
+            managers={
+                team_id: assignee_memberships[team_id].get("ancestors") or []
+                for team_id in task_filter["team_id"]["$in"]
+            }
         )
-        
-        if not updated_task:
+    
+    if not updated_task:
+        # Follow-up read only to report why the conditional write missed
+        task = await TaskService.get_task(db, task_obj_id)
+        if not task:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found"
             )
         
-        # Convert ObjectIds to strings
-        updated_task["_id"] = str(updated_task["_id"])
-        updated_task["team_id"] = str(updated_task["team_id"])
-        updated_task["assigned_to"] = str(updated_task["assigned_to"])
-        updated_task["created_by"] = str(updated_task["created_by"])
-        
-        return updated_task
+        membership = caller_memberships.get(task["team_id"])
+        if not membership or membership["role"] not in [Role.ADMIN, Role.SUBADMIN]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only Admin or Sub-Admin can reassign tasks"
+            )
         
-    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
+            detail="Assigned user is not a member of this team"
         )
+    
+    return task_serializer.response(updated_task)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -307,34 +707,40 @@ async def delete_task(
             detail="Invalid task ID format"
         )
     
-    # Get task
-    task = await TaskService.get_task(db, task_obj_id)
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-    
-    # Check permissions: creator or admin can delete
-    team_id_str = str(task["team_id"])
-    membership = await require_team_member(team_id_str, current_user, db)
+    # Permission predicate: own tasks in the user's teams, or any task as admin
+    memberships = await get_user_memberships([current_user["_id"]], db)
+    task_filter = task_delete_filter(current_user, memberships[current_user["_id"]])
     
-    is_creator = task["created_by"] == current_user["_id"]
-    is_admin = membership["role"] == Role.ADMIN
+    deleted = False
+    if task_filter:
+        deleted = await TaskService.delete_task(db, task_obj_id, filter_criteria=task_filter)
     
-    if not (is_creator or is_admin):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only task creator or team admin can delete tasks"
-        )
+    if not deleted:
+        await raise_task_write_error(db, task_obj_id, "Only task creator or team admin can delete tasks")
     
-    deleted = await TaskService.delete_task(db, task_obj_id)
+    return None
+
+
+async def raise_task_write_error(db, task_id: ObjectId, forbidden_detail: str):
+    """
+    Explain why a conditional task write matched no document.
     
-    if not deleted:
+    Args:
+        db: Database instance
+        task_id: Task ObjectId
+        forbidden_detail: Error message when the task exists
+        
+    Raises:
+        HTTPException 404: If the task does not exist
+        HTTPException 403: If the task exists but the user may not modify it
+    """
+    if not await TaskService.get_task(db, task_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    return None
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=forbidden_detail
+    )
@@ -2,19 +2,39 @@
 Team management API routes.
 Handles team CRUD operations with RBAC enforcement.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from bson import ObjectId
-from typing import List
+from typing import List, Optional
 
 from app.schemas.team import TeamCreate, TeamUpdate, TeamResponse
+from app.schemas.task import TaskStatsResponse
 from app.services.team_service import TeamService
+from app.services.task_service import TaskService
+from app.services.team_deletion_service import TeamDeletionService
+from app.schemas.job import JobResponse
+from app.routes.jobs import job_serializer
 from app.dependencies.auth import get_current_user
-from app.dependencies.rbac import require_team_admin, require_team_member
+from app.dependencies.rbac import (
+    require_team_admin,
+    require_team_member,
+    build_visible_tasks_filter,
+    visibility_scope,
+)
 from app.db.mongodb import get_database
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.fields import response_fields, parse_fields, partial_response
+from app.core.serialization import DocumentSerializer
 
 
 router = APIRouter(prefix="/teams", tags=["Teams"])
 
+# Field names accepted by the `fields` query parameter
+TEAM_RESPONSE_FIELDS = response_fields(TeamResponse)
+
+# Renders service documents in the TeamResponse shape without re-validation
+team_serializer = DocumentSerializer(TeamResponse)
+task_stats_serializer = DocumentSerializer(TaskStatsResponse)
+
 
 @router.post("", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
 async def create_team(
@@ -34,31 +54,46 @@ async def create_team(
         description=team_data.description
     )
     
-    # Convert ObjectIds to strings
-    team["_id"] = str(team["_id"])
-    team["created_by"] = str(team["created_by"])
-    
-    return team
+    return team_serializer.response(team, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("", response_model=List[TeamResponse])
 async def list_my_teams(
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return, e.g. name"),
     current_user = Depends(get_current_user),
     db = Depends(get_database)
 ):
     """
-    List all teams the current user belongs to.
+    List the teams the current user belongs to, one page at a time.
+    
+    Returns teams with the user's role in each team, ordered by team ID.
+    Pass `fields` to return only some fields (plus `_id`).
     
-    Returns teams with the user's role in each team.
+    When more teams may follow, the `X-Next-Cursor` response header
+    carries the cursor for the next page.
     """
-    teams = await TeamService.list_user_teams(db, current_user["_id"])
+    try:
+        after = decode_cursor(cursor)["_id"] if cursor else None
+        requested_fields = parse_fields(fields, TEAM_RESPONSE_FIELDS)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    teams, last_team_id = await TeamService.list_user_teams(db, current_user["_id"], limit, after=after)
     
-    # Convert ObjectIds to strings
-    for team in teams:
-        team["_id"] = str(team["_id"])
-        team["created_by"] = str(team["created_by"])
+    # Continue after the last membership read, even if its team was skipped
+    headers = {}
+    if last_team_id is not None:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor({"_id": last_team_id})
     
-    return teams
+    if requested_fields:
+        return partial_response(teams, requested_fields, headers)
+    
+    return team_serializer.response(teams, headers=headers)
 
 
 @router.get("/{team_id}", response_model=TeamResponse)
@@ -88,11 +123,36 @@ async def get_team(
             detail="Team not found"
         )
     
-    # Convert ObjectIds to strings
-    team["_id"] = str(team["_id"])
-    team["created_by"] = str(team["created_by"])
+    return team_serializer.response(team)
+
+
+@router.get("/{team_id}/stats", response_model=TaskStatsResponse)
+async def get_team_stats(
+    team_id: str,
+    current_user = Depends(get_current_user),
+    membership = Depends(require_team_member),
+    db = Depends(get_database)
+):
+    """
+    Get task counts by status, priority and assignee for dashboards.
+    
+    Requires: Team membership.
+    
+    Counts cover the tasks the caller can see (same rules as the task
+    list): Admins the whole team, Sub-Admins the tasks of members they
+    manage, Members their own tasks. Counts may lag writes by a few
+    seconds.
+    """
+    task_filter = build_visible_tasks_filter(membership["team_id"], current_user, membership)
+    
+    stats = await TaskService.get_task_stats(
+        db,
+        membership["team_id"],
+        visibility_scope(current_user, membership),
+        task_filter
+    )
     
-    return team
+    return task_stats_serializer.response(stats)
 
 
 @router.put("/{team_id}", response_model=TeamResponse)
@@ -128,16 +188,13 @@ async def update_team(
             detail="Team not found"
         )
     
-    # Convert ObjectIds to strings
-    team["_id"] = str(team["_id"])
-    team["created_by"] = str(team["created_by"])
-    
-    return team
+    return team_serializer.response(team)
 
 
-@router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{team_id}", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def delete_team(
     team_id: str,
+    current_user = Depends(get_current_user),
     membership = Depends(require_team_admin),
     db = Depends(get_database)
 ):
@@ -146,6 +203,10 @@ async def delete_team(
     
     Requires: Admin role in the team.
     
+    The team disappears from every read immediately; its memberships and
+    tasks are deleted by a background job. Returns 202 with the job, whose
+    progress is available at `GET /jobs/{job_id}` (see `Location`).
+    
     **Warning**: This action is irreversible!
     """
     try:
@@ -156,12 +217,16 @@ async def delete_team(
             detail="Invalid team ID format"
         )
     
-    deleted = await TeamService.delete_team(db, team_obj_id)
+    job = await TeamDeletionService.start(db, team_obj_id, current_user["_id"])
     
-    if not deleted:
+    if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Team not found"
         )
     
-    return None
+    return job_serializer.response(
+        job,
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/api/v1/jobs/{job['_id']}"}
+    )
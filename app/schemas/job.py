@@ -0,0 +1,21 @@
+"""
+Pydantic schemas for background job responses.
+"""
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class JobResponse(BaseModel):
+    """Schema for background job status in responses."""
+    id: str = Field(..., alias="_id")
+    type: str
+    status: str
+    team_id: str
+    progress: Dict[str, int]
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        populate_by_name = True
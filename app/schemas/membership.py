@@ -3,7 +3,7 @@ Pydantic schemas for Membership-related API requests and responses.
 """
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.models.membership import Role
 
 
@@ -14,6 +14,23 @@ class MembershipCreate(BaseModel):
     managed_by: Optional[str] = Field(None, description="Sub-Admin managing this member (for members only)")
 
 
+# Maximum number of rows accepted by one JSON import request
+IMPORT_MAX_ROWS = 10000
+
+
+class MembershipImportRow(BaseModel):
+    """Schema for one member in a bulk import; name the user by ID or email."""
+    user_id: Optional[str] = Field(None, description="User ID to add to the team")
+    email: Optional[str] = Field(None, description="Email of the user to add (if no user_id)")
+    role: Role = Field(default=Role.MEMBER, description="Role for the new member")
+    managed_by: Optional[str] = Field(None, description="User ID or email of the managing Sub-Admin")
+
+
+class MembershipImport(BaseModel):
+    """Schema for bulk member import request."""
+    members: List[MembershipImportRow] = Field(..., min_length=1, max_length=IMPORT_MAX_ROWS)
+
+
 class MembershipUpdate(BaseModel):
     """Schema for updating a member's role."""
     role: Role = Field(..., description="New role for the member")
@@ -3,7 +3,8 @@ Pydantic schemas for Task-related API requests and responses.
 """
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import Dict, List, Optional
 from app.models.task import TaskStatus, TaskPriority
 
 
@@ -25,6 +26,40 @@ class TaskUpdate(BaseModel):
     priority: Optional[TaskPriority] = None
 
 
+# Maximum number of items accepted by one bulk request
+BULK_MAX_ITEMS = 1000
+
+
+class TaskBulkCreate(BaseModel):
+    """Schema for bulk task creation request."""
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    """Schema for one task update in a bulk request."""
+    id: str = Field(..., description="ID of the task to update")
+
+
+class TaskBulkUpdate(BaseModel):
+    """Schema for bulk task update request."""
+    tasks: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item in a bulk request, in request order."""
+    index: int
+    status_code: int
+    id: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class TaskBulkResponse(BaseModel):
+    """Schema for bulk task operation responses."""
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
 class TaskAssign(BaseModel):
     """Schema for task assignment/reassignment."""
     assigned_to: str = Field(..., description="User ID to assign the task to")
@@ -50,3 +85,32 @@ class TaskResponse(BaseModel):
     
     class Config:
         populate_by_name = True
+
+
+class TaskChangesResponse(BaseModel):
+    """Schema for a delta sync response."""
+    tasks: List[TaskResponse] = Field(..., description="Visible tasks created or updated since the token")
+    deleted: List[str] = Field(..., description="IDs of visible tasks deleted since the token")
+    sync_token: str = Field(..., description="Token to pass as `since` on the next sync")
+    has_more: bool = Field(..., description="Whether more changes are waiting; sync again right away")
+
+
+class TaskStatsResponse(BaseModel):
+    """Schema for task counts over the tasks visible to the caller."""
+    team_id: str
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    by_assignee: Dict[str, int]
+
+
+class TaskExportFormat(str, Enum):
+    """Output formats for the streaming task export."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class TaskSearchMode(str, Enum):
+    """Matching modes for task search."""
+    TEXT = "text"
+    PREFIX = "prefix"
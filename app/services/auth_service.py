@@ -5,7 +5,7 @@ Handles user registration, login, and token generation.
 from typing import Optional, Dict, Any
 from bson import ObjectId
 
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import hash_password_async, verify_password_async, create_access_token
 from app.models.user import UserModel
 from app.db.collections import USERS_COLLECTION
 
@@ -40,8 +40,8 @@ class AuthService:
         if existing_user:
             raise ValueError("Email already registered")
         
-        # Hash password
-        hashed_password = hash_password(password)
+        # Hash password off the event loop
+        hashed_password = await hash_password_async(password)
         
         # Create user document
         user_doc = UserModel.create_document(
@@ -78,8 +78,8 @@ class AuthService:
         if not user:
             return None
         
-        # Verify password
-        if not verify_password(password, user["hashed_password"]):
+        # Verify password off the event loop
+        if not await verify_password_async(password, user["hashed_password"]):
             return None
         
         return user
@@ -0,0 +1,100 @@
+"""
+Lock service.
+Named, expiring leases stored in MongoDB, so that work which must not
+run concurrently is serialized across all workers.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.db.collections import LOCKS_COLLECTION
+
+
+# Pause between attempts while waiting for a held lock
+LOCK_RETRY_SECONDS = 0.05
+
+
+class LockService:
+    """Service for named leases shared by all workers."""
+    
+    @staticmethod
+    async def acquire(db, name: str, seconds: float) -> Optional[ObjectId]:
+        """
+        Take a lease unless another holder's lease is still running.
+        
+        Args:
+            db: Database instance
+            name: Lock name
+            seconds: Lease duration; the lock frees itself afterwards
+        
+        Returns:
+            Owner token to renew or release the lease with, or None if the
+            lock is held
+        """
+        now = datetime.utcnow()
+        owner = ObjectId()
+        try:
+            await db[LOCKS_COLLECTION].update_one(
+                {"_id": name, "expires_at": {"$lt": now}},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=seconds)}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # The lock exists and has not expired
+            return None
+        return owner
+    
+    @staticmethod
+    async def renew(db, name: str, owner: ObjectId, seconds: float) -> bool:
+        """
+        Extend a held lease.
+        
+        Returns:
+            False if the lease was lost (expired and taken by another holder)
+        """
+        result = await db[LOCKS_COLLECTION].update_one(
+            {"_id": name, "owner": owner},
+            {"$set": {"expires_at": datetime.utcnow() + timedelta(seconds=seconds)}}
+        )
+        return result.matched_count == 1
+    
+    @staticmethod
+    async def release(db, name: str, owner: ObjectId) -> None:
+        """Free a held lease; a lease already taken over is left alone."""
+        await db[LOCKS_COLLECTION].delete_one({"_id": name, "owner": owner})
+    
+    @staticmethod
+    @asynccontextmanager
+    async def hold(db, name: str, seconds: float, wait: float) -> AsyncIterator[ObjectId]:
+        """
+        Hold a lock for the duration of a block, waiting for it if needed.
+        
+        Args:
+            db: Database instance
+            name: Lock name
+            seconds: Lease duration; must exceed the block's running time
+            wait: Maximum seconds to wait for the lock
+        
+        Yields:
+            Owner token of the lease
+        
+        Raises:
+            ValueError: If the lock is still held after `wait` seconds
+        """
+        deadline = time.monotonic() + wait
+        while True:
+            owner = await LockService.acquire(db, name, seconds)
+            if owner is not None:
+                break
+            if time.monotonic() >= deadline:
+                raise ValueError("Another change is in progress; try again")
+            await asyncio.sleep(LOCK_RETRY_SECONDS)
+        
+        try:
+            yield owner
+        finally:
+            await LockService.release(db, name, owner)
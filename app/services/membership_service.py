@@ -2,11 +2,51 @@
 Membership service.
 Handles team membership and role management.
 """
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Set, AsyncIterator, Iterable
 from bson import ObjectId
+from pymongo import UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core import events
+from app.core.fields import build_projection
 
 from app.models.membership import MembershipModel, Role
-from app.db.collections import MEMBERSHIPS_COLLECTION, USERS_COLLECTION
+from app.services.lock_service import LockService
+from app.services.permission_service import PermissionService
+from app.services.task_service import TaskService
+from app.services.team_stats_service import TeamStatsService
+from app.db.collections import MEMBERSHIPS_COLLECTION, USERS_COLLECTION, TASKS_COLLECTION, TEAMS_COLLECTION
+
+
+# Rows resolved and inserted per batch by the bulk import
+IMPORT_BATCH_SIZE = 1000
+
+# Memberships re-chained per batch when a manager changes
+SUBTREE_BATCH_SIZE = 500
+
+# Lease on a team's hierarchy lock, renewed per re-chained batch
+HIERARCHY_LOCK_SECONDS = 60
+
+# How long a management change waits for another one in the same team
+HIERARCHY_LOCK_WAIT_SECONDS = 10
+
+# MongoDB duplicate key error code (unique (user_id, team_id) index)
+DUPLICATE_KEY_ERROR = 11000
+
+# Reported when members are added to a team that is being deleted
+TEAM_DELETING_DETAIL = "Team is being deleted"
+
+# Populated membership fields and the stored reference each is resolved from
+MEMBERSHIP_POPULATED_FIELDS = {
+    "user_email": "user_id",
+    "user_full_name": "user_id",
+}
+
+
+def _hierarchy_lock_name(team_id: ObjectId) -> str:
+    """Name of the lock serializing management changes in a team."""
+    return f"hierarchy:{team_id}"
 
 
 class MembershipService:
@@ -34,8 +74,14 @@ class MembershipService:
             Created membership document
             
         Raises:
-            ValueError: If user is already a member or user doesn't exist
+            ValueError: If user is already a member, user doesn't exist,
+                the manager is not a member of the team, the team is being
+                deleted or another management change in the team is still
+                running
         """
+        if await MembershipService._team_deleting(db, team_id):
+            raise ValueError(TEAM_DELETING_DETAIL)
+        
         # Check if user exists
         user = await db[USERS_COLLECTION].find_one({"_id": user_id})
         if not user:
@@ -49,59 +95,318 @@ class MembershipService:
         if existing:
             raise ValueError("User is already a member of this team")
         
-        # Create membership document
-        membership_doc = MembershipModel.create_document(
-            user_id=user_id,
-            team_id=team_id,
-            role=role,
-            managed_by=managed_by
-        )
-        
-        # Insert membership
-        result = await db[MEMBERSHIPS_COLLECTION].insert_one(membership_doc)
-        membership_doc["_id"] = result.inserted_id
+        async with MembershipService._hierarchy_lock(db, team_id):
+            ancestors = await MembershipService._get_manager_chain(db, team_id, managed_by)
+            
+            # Create membership document
+            membership_doc = MembershipModel.create_document(
+                user_id=user_id,
+                team_id=team_id,
+                role=role,
+                managed_by=managed_by,
+                ancestors=ancestors
+            )
+            
+            # Insert membership
+            result = await db[MEMBERSHIPS_COLLECTION].insert_one(membership_doc)
+            membership_doc["_id"] = result.inserted_id
+            
+            # A deletion that started meanwhile may have hidden memberships already
+            if await MembershipService._team_deleting(db, team_id):
+                await db[MEMBERSHIPS_COLLECTION].delete_one({"_id": membership_doc["_id"]})
+                raise ValueError(TEAM_DELETING_DETAIL)
+            
+            # Tasks left over from an earlier membership pick up the new managers
+            if ancestors:
+                await MembershipService._apply_chains(db, team_id, {user_id: ancestors}, memberships=False)
+            
+        await PermissionService.record_change(db, team_id)
+        await events.event_hub.publish(events.MEMBERSHIP_ADDED, team_id, membership=membership_doc)
         
         return membership_doc
     
     @staticmethod
-    async def get_team_members(db, team_id: ObjectId) -> List[Dict[str, Any]]:
+    async def import_members(
+        db,
+        team_id: ObjectId,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int = IMPORT_BATCH_SIZE
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Get all members of a team with their user details.
+        Add many members to a team, reporting the outcome of every row.
+        
+        Each row names the user by `user_id` or `email`, a `role`, and an
+        optional `managed_by` (user id or email). Per batch, users and
+        managers are resolved with one `$in` query, their management
+        chains with another, and the memberships are inserted with one
+        unordered `insert_many`; existing members are detected by the
+        unique `(user_id, team_id)` index rather than by a lookup per row.
+        A manager must already be a member or be added by an earlier row.
         
         Args:
             db: Database instance
             team_id: Team ObjectId
+            rows: Row dicts with raw string values, in input order
+            batch_size: Rows resolved and inserted per batch
+            
+        Yields:
+            Lists of row reports `{"row", "status", "user_id", "detail"}`,
+            with `status` "created" or "failed" and rows numbered from 1
+        """
+        batch = []
+        for number, row in enumerate(rows, start=1):
+            batch.append((number, row))
+            if len(batch) >= batch_size:
+                yield await MembershipService._import_locked(db, team_id, batch)
+                batch = []
+        
+        if batch:
+            yield await MembershipService._import_locked(db, team_id, batch)
+    
+    @staticmethod
+    async def _import_locked(
+        db,
+        team_id: ObjectId,
+        batch: List[tuple]
+    ) -> List[Dict[str, Any]]:
+        """Import one batch under the team's hierarchy lock; see `_import_batch`."""
+        try:
+            async with MembershipService._hierarchy_lock(db, team_id):
+                return await MembershipService._import_batch(db, team_id, batch)
+        except ValueError as e:
+            return [
+                {"row": number, "status": "failed", "user_id": None, "detail": str(e)}
+                for number, _ in batch
+            ]
+    
+    @staticmethod
+    async def _import_batch(
+        db,
+        team_id: ObjectId,
+        batch: List[tuple]
+    ) -> List[Dict[str, Any]]:
+        """
+        Resolve and insert one batch of import rows.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+            batch: (row number, row dict) pairs
             
         Returns:
-            List of membership documents with populated user data
+            One report per row, in batch order
         """
-        # Get all memberships for the team
-        memberships = await db[MEMBERSHIPS_COLLECTION].find({
-            "team_id": team_id
-        }).to_list(length=None)
+        reports = [
+            {"row": number, "status": "failed", "user_id": None, "detail": None}
+            for number, _ in batch
+        ]
         
-        if not memberships:
-            return []
+        if await MembershipService._team_deleting(db, team_id):
+            for report in reports:
+                report["detail"] = TEAM_DELETING_DETAIL
+            return reports
         
-        # Get user IDs
-        user_ids = [m["user_id"] for m in memberships]
+        # Parse references; ids and emails are resolved together below
+        parsed = []
+        for report, (_, row) in zip(reports, batch):
+            try:
+                user_ref = MembershipService._parse_user_ref(row.get("user_id"), row.get("email"))
+                manager_ref = MembershipService._parse_user_ref(row.get("managed_by"))
+            except ValueError as e:
+                report["detail"] = str(e)
+                continue
+            try:
+                role = Role(row.get("role") or Role.MEMBER.value)
+            except ValueError:
+                report["detail"] = "Invalid role"
+                continue
+            if user_ref is None:
+                report["detail"] = "Either user_id or email is required"
+                continue
+            parsed.append((report, user_ref, manager_ref, role))
         
-        # Fetch user details
-        users = await db[USERS_COLLECTION].find({
-            "_id": {"$in": user_ids}
-        }).to_list(length=None)
+        refs = {ref for _, user_ref, manager_ref, _ in parsed for ref in (user_ref, manager_ref) if ref is not None}
+        ids = [ref for ref in refs if isinstance(ref, ObjectId)]
+        emails = [ref for ref in refs if isinstance(ref, str)]
+        
+        users = await db[USERS_COLLECTION].find(
+            {"$or": [{"_id": {"$in": ids}}, {"email": {"$in": emails}}]},
+            {"email": 1}
+        ).to_list(length=None)
+        resolved = {}
+        for user in users:
+            resolved[user["_id"]] = user["_id"]
+            resolved[user["email"]] = user["_id"]
+        
+        # Management chains of current members; rows add theirs as they go
+        existing = await db[MEMBERSHIPS_COLLECTION].find(
+            {"team_id": team_id, "user_id": {"$in": [user["_id"] for user in users]}},
+            {"_id": 0, "user_id": 1, "ancestors": 1}
+        ).to_list(length=None)
+        chains = {m["user_id"]: m.get("ancestors") or [] for m in existing}
+        
+        pending, membership_docs = [], []
+        for report, user_ref, manager_ref, role in parsed:
+            user_id = resolved.get(user_ref)
+            if user_id is None:
+                report["detail"] = "User not found"
+                continue
+            report["user_id"] = str(user_id)
+            
+            managed_by, ancestors = None, []
+            if manager_ref is not None:
+                managed_by = resolved.get(manager_ref)
+                if managed_by is None:
+                    report["detail"] = "Manager not found"
+                    continue
+                if managed_by not in chains:
+                    report["detail"] = "Manager is not a member of this team"
+                    continue
+                ancestors = [managed_by] + chains[managed_by]
+            chains.setdefault(user_id, ancestors)
+            
+            pending.append(report)
+            membership_docs.append(MembershipModel.create_document(
+                user_id=user_id,
+                team_id=team_id,
+                role=role,
+                managed_by=managed_by,
+                ancestors=ancestors
+            ))
+        
+        if not membership_docs:
+            return reports
+        
+        failed = {}
+        try:
+            await db[MEMBERSHIPS_COLLECTION].insert_many(membership_docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = (
+                    "User is already a member of this team"
+                    if error.get("code") == DUPLICATE_KEY_ERROR
+                    else error.get("errmsg", "Write failed")
+                )
+        
+        created, manager_syncs = [], []
+        for index, (report, doc) in enumerate(zip(pending, membership_docs)):
+            if index in failed:
+                report["detail"] = failed[index]
+                continue
+            report["status"] = "created"
+            created.append(doc)
+            if doc["ancestors"]:
+                manager_syncs.append(doc)
+        
+        # A deletion that started meanwhile may have hidden memberships already
+        if created and await MembershipService._team_deleting(db, team_id):
+            await db[MEMBERSHIPS_COLLECTION].delete_many({"_id": {"$in": [doc["_id"] for doc in created]}})
+            for report in pending:
+                if report["status"] == "created":
+                    report["status"] = "failed"
+                    report["detail"] = TEAM_DELETING_DETAIL
+            return reports
+        
+        # Tasks left over from earlier memberships pick up the new managers
+        if manager_syncs:
+            await MembershipService._apply_chains(
+                db, team_id, {doc["user_id"]: doc["ancestors"] for doc in manager_syncs}, memberships=False
+            )
+        
+        # New members can act as soon as their batch is in
+        if created:
+            await PermissionService.record_change(db, team_id)
+        for doc in created:
+            await events.event_hub.publish(events.MEMBERSHIP_ADDED, team_id, membership=doc)
+        
+        return reports
+    
+    @staticmethod
+    def _parse_user_ref(user_id: Optional[str], email: Optional[str] = None):
+        """
+        Turn an import row's user reference into an ObjectId or a lowercased email.
+        
+        Values containing "@" are treated as emails, so `managed_by` may
+        name the manager either way.
+        
+        Returns:
+            ObjectId, email string, or None if the row names no user
+            
+        Raises:
+            ValueError: If the value is neither an email nor a valid ObjectId
+        """
+        value = (user_id or "").strip() or (email or "").strip()
+        if not value:
+            return None
+        if "@" in value:
+            return value.lower()
+        if not ObjectId.is_valid(value):
+            raise ValueError("Invalid ID format")
+        return ObjectId(value)
+    
+    @staticmethod
+    async def get_team_members(
+        db,
+        team_id: ObjectId,
+        fields: Optional[Set[str]] = None,
+        role: Optional[Role] = None,
+        managed_by: Optional[ObjectId] = None,
+        limit: int = 100,
+        after: Optional[ObjectId] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get one page of a team's members with their user details.
         
-        # Create user map
-        user_map = {u["_id"]: u for u in users}
+        A single aggregation reads the page in `_id` order from the
+        `(team_id, ...)` indexes and joins each membership to its user
+        with a `$lookup` that fetches only `email` and `full_name`.
         
-        # Populate user details in memberships
-        for membership in memberships:
-            user = user_map.get(membership["user_id"])
-            if user:
-                membership["user_email"] = user["email"]
-                membership["user_full_name"] = user["full_name"]
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+            fields: Optional response fields to fetch and populate
+            role: Optional role to filter by
+            managed_by: Optional managing Sub-Admin to filter by
+            limit: Maximum number of members to return
+            after: Optional `_id` of the last membership on the previous page
+            
+        Returns:
+            List of membership documents with populated user data
+        """
+        match: Dict[str, Any] = {"team_id": team_id}
+        if role is not None:
+            match["role"] = role.value
+        if managed_by is not None:
+            match["managed_by"] = managed_by
+        if after is not None:
+            match["_id"] = {"$gt": after}
         
-        return memberships
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": match},
+            {"$sort": {"_id": 1}},
+            {"$limit": limit},
+        ]
+        if fields:
+            pipeline.append({"$project": build_projection(fields, MEMBERSHIP_POPULATED_FIELDS)})
+        
+        # User details are only looked up when requested
+        if fields is None or fields & MEMBERSHIP_POPULATED_FIELDS.keys():
+            pipeline += [
+                {"$lookup": {
+                    "from": USERS_COLLECTION,
+                    "localField": "user_id",
+                    "foreignField": "_id",
+                    "pipeline": [{"$project": {"_id": 0, "email": 1, "full_name": 1}}],
+                    "as": "user"
+                }},
+                {"$addFields": {
+                    "user_email": {"$first": "$user.email"},
+                    "user_full_name": {"$first": "$user.full_name"}
+                }},
+                {"$project": {"user": 0}},
+            ]
+        
+        return await db[MEMBERSHIPS_COLLECTION].aggregate(pipeline).to_list(length=limit)
     
     @staticmethod
     async def get_managed_members(
@@ -110,7 +415,11 @@ class MembershipService:
         subadmin_id: ObjectId
     ) -> List[Dict[str, Any]]:
         """
-        Get all members managed by a specific Sub-Admin.
+        Get every member below a Sub-Admin, directly or through other
+        Sub-Admins.
+        
+        One query on the `(team_id, ancestors)` index, however deep the
+        hierarchy.
         
         Args:
             db: Database instance
@@ -122,7 +431,7 @@ class MembershipService:
         """
         return await db[MEMBERSHIPS_COLLECTION].find({
             "team_id": team_id,
-            "managed_by": subadmin_id
+            "ancestors": subadmin_id
         }).to_list(length=None)
     
     @staticmethod
@@ -136,6 +445,11 @@ class MembershipService:
         """
         Update a member's role in a team.
         
+        A new manager moves the member together with everyone below them;
+        see `_rewrite_chains`. The cycle check and the rewrite run under
+        the team's hierarchy lock, so concurrent changes cannot combine
+        into a cycle.
+        
         Args:
             db: Database instance
             user_id: User ObjectId
@@ -145,16 +459,38 @@ class MembershipService:
             
         Returns:
             Updated membership document or None if not found
+            
+        Raises:
+            ValueError: If the manager is not a member of the team, is the
+                member or someone below them, or another management change
+                in the team is still running
         """
         update_data = {"role": new_role.value}
-        if managed_by is not None:
-            update_data["managed_by"] = managed_by
+        if managed_by is None:
+            result = await db[MEMBERSHIPS_COLLECTION].find_one_and_update(
+                {"user_id": user_id, "team_id": team_id},
+                {"$set": update_data},
+                return_document=True
+            )
+        else:
+            async with MembershipService._hierarchy_lock(db, team_id) as owner:
+                ancestors = await MembershipService._get_manager_chain(db, team_id, managed_by)
+                if user_id == managed_by or user_id in ancestors:
+                    raise ValueError("A member cannot be managed by themselves or by someone they manage")
+                update_data["managed_by"] = managed_by
+                update_data["ancestors"] = ancestors
+                
+                result = await db[MEMBERSHIPS_COLLECTION].find_one_and_update(
+                    {"user_id": user_id, "team_id": team_id},
+                    {"$set": update_data},
+                    return_document=True
+                )
+                if result:
+                    await MembershipService._rewrite_chains(db, team_id, user_id, ancestors, lock_owner=owner)
         
-        result = await db[MEMBERSHIPS_COLLECTION].find_one_and_update(
-            {"user_id": user_id, "team_id": team_id},
-            {"$set": update_data},
-            return_document=True
-        )
+        if result:
+            await PermissionService.record_change(db, team_id)
+            await events.event_hub.publish(events.MEMBERSHIP_UPDATED, team_id, membership=result)
         
         return result
     
@@ -167,6 +503,8 @@ class MembershipService:
         """
         Remove a member from a team.
         
+        Everyone below the member moves up to the member's own manager.
+        
         Args:
             db: Database instance
             user_id: User ObjectId
@@ -174,10 +512,254 @@ class MembershipService:
             
         Returns:
             True if removed, False if not found
+            
+        Raises:
+            ValueError: If another management change in the team is still
+                running
         """
-        result = await db[MEMBERSHIPS_COLLECTION].delete_one({
-            "user_id": user_id,
-            "team_id": team_id
-        })
+        async with MembershipService._hierarchy_lock(db, team_id) as owner:
+            removed = await db[MEMBERSHIPS_COLLECTION].find_one_and_delete({
+                "user_id": user_id,
+                "team_id": team_id
+            })
+            
+            if not removed:
+                return False
+            
+            # A removed member's tasks are no longer visible to their managers
+            await MembershipService._rewrite_chains(
+                db, team_id, user_id, removed.get("ancestors") or [], keep_member=False, lock_owner=owner
+            )
+        
+        await PermissionService.record_change(db, team_id)
+        await events.event_hub.publish(events.MEMBERSHIP_REMOVED, team_id, membership=removed)
+        
+        return True
+    
+    @staticmethod
+    async def verify_chains(db, team_id: ObjectId) -> int:
+        """
+        Repair management chains that no longer follow `managed_by`.
+        
+        Rebuilds every member's chain from the team's `managed_by` links,
+        detaching members whose manager left the team or whose links loop
+        back to them, and rewrites the memberships and tasks whose stored
+        chain differs. Skipped while another management change in the team
+        holds the hierarchy lock.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+            
+        Returns:
+            Number of memberships repaired
+        """
+        owner = await LockService.acquire(db, _hierarchy_lock_name(team_id), HIERARCHY_LOCK_SECONDS)
+        if owner is None:
+            return 0
+        
+        try:
+            memberships = await db[MEMBERSHIPS_COLLECTION].find(
+                {"team_id": team_id},
+                {"user_id": 1, "managed_by": 1, "ancestors": 1}
+            ).to_list(length=None)
+            managers = {m["user_id"]: m.get("managed_by") for m in memberships}
+            
+            # Detach members whose manager left or whose links loop back
+            detached = set()
+            for user_id, manager in managers.items():
+                seen = set()
+                while manager in managers and manager != user_id and manager not in seen:
+                    seen.add(manager)
+                    manager = managers[manager]
+                if manager == user_id or (managers[user_id] is not None and managers[user_id] not in managers):
+                    detached.add(user_id)
+            for user_id in detached:
+                managers[user_id] = None
+            
+            chains = {}
+            for membership in memberships:
+                user_id, chain = membership["user_id"], []
+                manager = managers[user_id]
+                while manager is not None:
+                    chain.append(manager)
+                    manager = managers.get(manager)
+                if chain != (membership.get("ancestors") or []) or user_id in detached:
+                    chains[user_id] = chain
+            
+            for start in range(0, len(chains), SUBTREE_BATCH_SIZE):
+                batch = dict(list(chains.items())[start:start + SUBTREE_BATCH_SIZE])
+                await MembershipService._apply_chains(db, team_id, batch)
+                await LockService.renew(db, _hierarchy_lock_name(team_id), owner, HIERARCHY_LOCK_SECONDS)
+        finally:
+            await LockService.release(db, _hierarchy_lock_name(team_id), owner)
+        
+        if chains:
+            await PermissionService.record_change(db, team_id)
+        return len(chains)
+    
+    @staticmethod
+    async def _team_deleting(db, team_id: ObjectId) -> bool:
+        """
+        Whether a team is gone or being deleted.
+        
+        Read from the database rather than the team cache, which other
+        workers may not have refreshed yet. Checked again after inserting
+        memberships: a deletion marks the team before it hides the
+        team's memberships, so one of the two always catches a new member.
+        """
+        team = await db[TEAMS_COLLECTION].find_one({"_id": team_id}, {"deleting_at": 1})
+        return team is None or "deleting_at" in team
+    
+    @staticmethod
+    def _hierarchy_lock(db, team_id: ObjectId):
+        """Hold the team's hierarchy lock for a block; see `LockService.hold`."""
+        return LockService.hold(
+            db, _hierarchy_lock_name(team_id), HIERARCHY_LOCK_SECONDS, HIERARCHY_LOCK_WAIT_SECONDS
+        )
+    
+    @staticmethod
+    async def _get_manager_chain(
+        db,
+        team_id: ObjectId,
+        managed_by: Optional[ObjectId]
+    ) -> List[ObjectId]:
+        """
+        Get the `ancestors` of a member reporting to `managed_by`.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+            managed_by: Managing Sub-Admin, or None
+            
+        Returns:
+            Management chain, nearest manager first
+            
+        Raises:
+            ValueError: If the manager is not a member of the team
+        """
+        if managed_by is None:
+            return []
+        
+        manager = await db[MEMBERSHIPS_COLLECTION].find_one(
+            {"user_id": managed_by, "team_id": team_id},
+            {"user_id": 1, "ancestors": 1}
+        )
+        if not manager:
+            raise ValueError("Manager is not a member of this team")
+        return MembershipModel.chain_below(manager)
+    
+    @staticmethod
+    async def _rewrite_chains(
+        db,
+        team_id: ObjectId,
+        user_id: ObjectId,
+        ancestors: List[ObjectId],
+        keep_member: bool = True,
+        batch_size: int = SUBTREE_BATCH_SIZE,
+        lock_owner: Optional[ObjectId] = None
+    ) -> int:
+        """
+        Give a member's tasks and everyone below them a new management chain.
+        
+        Only the member's subtree is touched: memberships whose
+        `ancestors` contain the member are read in `_id` batches from the
+        `(team_id, ancestors, _id)` index, and each keeps its chain up to
+        the member with the new chain spliced in above it.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+            user_id: Member whose management chain changed
+            ancestors: The member's new `ancestors` (their old ones when
+                removed)
+            keep_member: False when the member left the team; the subtree
+                then reports to `ancestors` directly
+            batch_size: Memberships re-chained per batch
+            lock_owner: Owner token of the held hierarchy lock, renewed
+                after every batch
+            
+        Returns:
+            Number of memberships below the member that were updated
+        """
+        await MembershipService._apply_chains(
+            db, team_id, {user_id: ancestors if keep_member else []}, memberships=False
+        )
+        
+        tail = [user_id] + ancestors if keep_member else ancestors
+        updated, after = 0, None
+        while True:
+            query: Dict[str, Any] = {"team_id": team_id, "ancestors": user_id}
+            if after is not None:
+                query["_id"] = {"$gt": after}
+            batch = await db[MEMBERSHIPS_COLLECTION].find(
+                query, {"user_id": 1, "ancestors": 1}
+            ).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+            if not batch:
+                return updated
+            
+            chains = {}
+            for membership in batch:
+                chain = membership["ancestors"]
+                chains[membership["user_id"]] = chain[:chain.index(user_id)] + tail
+            await MembershipService._apply_chains(db, team_id, chains)
+            if lock_owner is not None:
+                await LockService.renew(db, _hierarchy_lock_name(team_id), lock_owner, HIERARCHY_LOCK_SECONDS)
+            
+            updated += len(batch)
+            after = batch[-1]["_id"]
+    
+    @staticmethod
+    async def _apply_chains(
+        db,
+        team_id: ObjectId,
+        chains: Dict[ObjectId, List[ObjectId]],
+        memberships: bool = True
+    ) -> None:
+        """
+        Store new management chains on members' memberships and tasks.
+        
+        Tasks carry the assignee's chain as `manager_ids` so that
+        Sub-Admin visibility is a plain indexed `(team_id, manager_ids)`
+        query. Stats counters are moved before the tasks are rewritten,
+        and tasks leaving a manager's view get a tombstone for delta sync.
+        Rewritten tasks have `updated_at` bumped so new managers sync them.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+            chains: New `ancestors` keyed by member User ObjectId
+            memberships: Whether to update the memberships as well
+        """
+        if memberships:
+            await db[MEMBERSHIPS_COLLECTION].bulk_write([
+                UpdateOne(
+                    {"user_id": user_id, "team_id": team_id},
+                    {"$set": {"ancestors": chain, "managed_by": chain[0] if chain else None}}
+                )
+                for user_id, chain in chains.items()
+            ], ordered=False)
+        
+        # Tasks with a manager missing from the new chain
+        removed = db[TASKS_COLLECTION].find(
+            {"team_id": team_id, "$or": [
+                {"assigned_to": user_id, "manager_ids": {"$elemMatch": {"$nin": chain}}}
+                for user_id, chain in chains.items()
+            ]},
+            {"team_id": 1, "assigned_to": 1, "manager_ids": 1}
+        )
+        while True:
+            batch = await removed.to_list(length=SUBTREE_BATCH_SIZE)
+            if not batch:
+                break
+            await TaskService.record_removals(db, batch)
         
-        return result.deleted_count > 0
+        await TeamStatsService.move_managers(db, team_id, chains)
+        now = datetime.utcnow()
+        await db[TASKS_COLLECTION].bulk_write([
+            UpdateMany(
+                {"team_id": team_id, "assigned_to": user_id, "manager_ids": {"$ne": chain}},
+                {"$set": {"manager_ids": chain, "updated_at": now}}
+            )
+            for user_id, chain in chains.items()
+        ], ordered=False)
@@ -0,0 +1,137 @@
+"""
+Permission service.
+Keeps a per-worker snapshot of each team's memberships so RBAC checks
+are answered from memory, revalidated against the team's membership
+version.
+"""
+import time
+from typing import Any, Dict, Optional, Set
+from bson import ObjectId
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.membership import ACTIVE_MEMBERSHIP_FILTER
+from app.services.team_version_service import TeamVersionService
+from app.db.collections import MEMBERSHIPS_COLLECTION
+
+
+# Membership fields kept in a snapshot
+SNAPSHOT_PROJECTION = {"user_id": 1, "team_id": 1, "role": 1, "managed_by": 1, "ancestors": 1, "joined_at": 1}
+
+
+class TeamPermissions:
+    """
+    Point-in-time view of a team's roles and managed members.
+    
+    Shared by every request of a worker; its documents must not be
+    mutated.
+    """
+    
+    def __init__(self, team_id: ObjectId, version: int, memberships: Dict[ObjectId, Dict[str, Any]]):
+        """
+        Args:
+            team_id: Team ObjectId
+            version: Team membership version the snapshot was loaded at
+            memberships: Active membership documents keyed by user ObjectId
+        """
+        self.team_id = team_id
+        self.version = version
+        self.memberships = memberships
+        self.managed: Dict[ObjectId, Set[ObjectId]] = {}
+        for user_id, membership in memberships.items():
+            for manager_id in membership.get("ancestors") or []:
+                self.managed.setdefault(manager_id, set()).add(user_id)
+        self.checked_at = time.monotonic()
+    
+    def membership(self, user_id: ObjectId) -> Optional[Dict[str, Any]]:
+        """Get a user's membership, or None if they are not a member."""
+        return self.memberships.get(user_id)
+    
+    def manages(self, subadmin_id: ObjectId, user_id: ObjectId) -> bool:
+        """Check whether a Sub-Admin manages a member, directly or indirectly."""
+        return user_id in self.managed.get(subadmin_id, ())
+
+
+# Team permission snapshots keyed by team ObjectId
+permission_cache = TTLCache(
+    "permissions",
+    maxsize=settings.PERMISSION_CACHE_MAX_SIZE,
+    ttl=settings.PERMISSION_CACHE_TTL_SECONDS
+)
+
+
+class PermissionService:
+    """Service for cached team permission snapshots."""
+    
+    @staticmethod
+    async def get_permissions(db, team_id: ObjectId) -> TeamPermissions:
+        """
+        Get a team's permission snapshot.
+        
+        A cached snapshot is used as is for
+        PERMISSION_CACHE_STALENESS_SECONDS; after that, one read of the
+        team's membership version decides whether it is still current or
+        must be reloaded. Membership writes on this worker drop the
+        snapshot immediately, so changes made elsewhere show up within
+        the staleness window.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+        
+        Returns:
+            TeamPermissions snapshot (empty for unknown teams)
+        """
+        snapshot = permission_cache.get(team_id)
+        if snapshot is not None:
+            if time.monotonic() - snapshot.checked_at < settings.PERMISSION_CACHE_STALENESS_SECONDS:
+                return snapshot
+            
+            version = await TeamVersionService.get_membership_version(db, team_id)
+            if version == snapshot.version:
+                snapshot.checked_at = time.monotonic()
+                return snapshot
+        
+        return await PermissionService.load(db, team_id)
+    
+    @staticmethod
+    async def load(db, team_id: ObjectId) -> TeamPermissions:
+        """
+        Read a team's active memberships into a new cached snapshot.
+        
+        The version is read first, so a write racing the load leaves the
+        snapshot with an older version and it is reloaded on the next
+        check.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+        
+        Returns:
+            TeamPermissions snapshot
+        """
+        version = await TeamVersionService.get_membership_version(db, team_id)
+        memberships = await db[MEMBERSHIPS_COLLECTION].find(
+            {"team_id": team_id, **ACTIVE_MEMBERSHIP_FILTER},
+            SNAPSHOT_PROJECTION
+        ).to_list(length=None)
+        
+        snapshot = TeamPermissions(team_id, version, {m["user_id"]: m for m in memberships})
+        permission_cache.set(team_id, snapshot)
+        return snapshot
+    
+    @staticmethod
+    async def record_change(db, team_id: ObjectId) -> None:
+        """
+        Record a change to a team's memberships.
+        
+        Bumps the team's data and membership versions and drops this
+        worker's snapshot. Must be called after every membership write
+        in place of `TeamVersionService.bump`.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+        """
+        await TeamVersionService.bump(db, team_id, memberships=True)
+        permission_cache.invalidate(team_id)
@@ -2,12 +2,50 @@
 Task service.
 Handles task CRUD operations with RBAC enforcement.
 """
-from typing import List, Dict, Any, Optional
+import asyncio
+import re
+from typing import List, Dict, Any, Optional, AsyncIterator, Set, Tuple
 from bson import ObjectId
-from datetime import datetime
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 
-from app.models.task import TaskModel, TaskStatus, TaskPriority
-from app.db.collections import TASKS_COLLECTION, USERS_COLLECTION, TEAMS_COLLECTION, MEMBERSHIPS_COLLECTION
+from app.core import events
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.fields import build_projection
+from app.models.task import TaskModel, TaskTombstoneModel, TaskStatus, TaskPriority
+from app.services.team_version_service import TeamVersionService
+from app.services.team_stats_service import TeamStatsService
+from app.services.team_service import TeamService
+from app.db.collections import (
+    TASKS_COLLECTION,
+    USERS_COLLECTION,
+    MEMBERSHIPS_COLLECTION,
+    TASK_TOMBSTONES_COLLECTION,
+)
+
+
+# Documents fetched per batch when streaming large result sets
+EXPORT_BATCH_SIZE = 1000
+
+# Documents sent per insert_many call, and tasks written concurrently, in bulk endpoints
+BULK_WRITE_BATCH_SIZE = 500
+
+# Populated task fields and the stored reference each is resolved from
+TASK_POPULATED_FIELDS = {
+    "assigned_to_name": "assigned_to",
+    "created_by_name": "created_by",
+    "team_name": "team_id",
+}
+
+
+# Task stats keyed by (team_id, visibility scope)
+task_stats_cache = TTLCache(
+    "task_stats",
+    maxsize=settings.TASK_STATS_CACHE_MAX_SIZE,
+    ttl=settings.TASK_STATS_CACHE_TTL_SECONDS
+)
 
 
 class TaskService:
@@ -59,15 +97,58 @@ class TaskService:
             created_by=created_by,
             description=description,
             status=status,
-            priority=priority
+            priority=priority,
+            manager_ids=assignee_membership.get("ancestors")
         )
         
         # Insert task
         result = await db[TASKS_COLLECTION].insert_one(task_doc)
         task_doc["_id"] = result.inserted_id
         
+        await TeamStatsService.record(db, created=[task_doc])
+        await TeamVersionService.bump(db, team_id)
+        await events.event_hub.publish(events.TASK_CREATED, team_id, task=task_doc)
+        
         return task_doc
     
+    @staticmethod
+    async def create_tasks(db, task_docs: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Insert many validated task documents.
+        
+        Documents are written with unordered `insert_many` calls of
+        `BULK_WRITE_BATCH_SIZE`, so one failing document does not stop
+        the rest. Membership checks are the caller's job (see the bulk
+        create route, which validates every assignee in one query).
+        
+        Args:
+            db: Database instance
+            task_docs: Documents from `TaskModel.create_document`; `_id` is
+                set on each one that was inserted
+            
+        Returns:
+            Error message per document, None where the insert succeeded
+        """
+        errors: List[Optional[str]] = [None] * len(task_docs)
+        
+        for start in range(0, len(task_docs), BULK_WRITE_BATCH_SIZE):
+            chunk = task_docs[start:start + BULK_WRITE_BATCH_SIZE]
+            try:
+                await db[TASKS_COLLECTION].insert_many(chunk, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    errors[start + error["index"]] = error.get("errmsg", "Write failed")
+        
+        inserted = [doc for doc, error in zip(task_docs, errors) if error is None]
+        await TeamStatsService.record(db, created=inserted)
+        
+        team_ids = {doc["team_id"] for doc in inserted}
+        await asyncio.gather(*(TeamVersionService.bump(db, team_id) for team_id in team_ids))
+        for doc in inserted:
+            await events.event_hub.publish(events.TASK_CREATED, doc["team_id"], task=doc)
+        
+        return errors
+    
     @staticmethod
     async def get_task(db, task_id: ObjectId) -> Optional[Dict[str, Any]]:
         """
@@ -87,43 +168,440 @@ class TaskService:
         db,
         filter_criteria: Dict[str, Any],
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        after: Optional[ObjectId] = None,
+        fields: Optional[Set[str]] = None
     ) -> List[Dict[str, Any]]:
         """
-        List tasks matching filter criteria.
+        List tasks matching filter criteria, ordered by `_id`.
+        
+        Passing `after` (keyset pagination) starts the page right after
+        that task with an index seek, so deep pages cost the same as the
+        first one. `skip` is kept for older clients and ignored when
+        `after` is given.
         
         Args:
             db: Database instance
             filter_criteria: MongoDB filter (from RBAC dependency)
-            skip: Number of records to skip (pagination)
+            skip: Number of records to skip (offset pagination)
             limit: Maximum number of records to return
+            after: Optional `_id` of the last task on the previous page
+            fields: Optional response fields to fetch and populate
             
         Returns:
             List of task documents
         """
+        query = dict(filter_criteria)
+        if after is not None:
+            query["_id"] = {"$gt": after}
+            skip = 0
+        
+        projection = build_projection(fields, TASK_POPULATED_FIELDS) if fields else None
+        
         tasks = await db[TASKS_COLLECTION].find(
-            filter_criteria
-        ).skip(skip).limit(limit).to_list(length=limit)
+            query, projection
+        ).sort("_id", 1).skip(skip).limit(limit).to_list(length=limit)
         
-        # Populate related data
-        for task in tasks:
-            # Get assignee name
-            assignee = await db[USERS_COLLECTION].find_one({"_id": task["assigned_to"]})
-            if assignee:
-                task["assigned_to_name"] = assignee["full_name"]
+        return await TaskService.populate_tasks(db, tasks, fields)
+    
+    @staticmethod
+    async def search_tasks(
+        db,
+        filter_criteria: Dict[str, Any],
+        query: str,
+        limit: int = 20,
+        after: Optional[Dict[str, Any]] = None,
+        fields: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search over task titles and descriptions, best match first.
+        
+        Uses the `task_text` index (title matches weigh more than
+        description matches). Results are ordered by `(score desc, _id)`
+        and each one carries its `score`, which together with `_id` is the
+        keyset cursor for the next page.
+        
+        Args:
+            db: Database instance
+            filter_criteria: MongoDB filter (from RBAC dependency); must
+                include `team_id`
+            query: Search terms, in MongoDB `$text` syntax
+            limit: Maximum number of results
+            after: `score` and `_id` of the last result of the previous page
+            fields: Optional response fields to fetch and populate
+        
+        Returns:
+            List of task documents with a `score` field
+        """
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": {**filter_criteria, "$text": {"$search": query}}},
+            {"$addFields": {"score": {"$meta": "textScore"}}},
+        ]
+        if after is not None:
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": after["score"]}},
+                {"score": after["score"], "_id": {"$gt": after["_id"]}},
+            ]}})
+        pipeline += [
+            {"$sort": {"score": -1, "_id": 1}},
+            {"$limit": limit},
+        ]
+        if fields:
+            pipeline.append({"$project": {**build_projection(fields, TASK_POPULATED_FIELDS), "score": 1}})
+        
+        tasks = await db[TASKS_COLLECTION].aggregate(pipeline).to_list(length=limit)
+        
+        return await TaskService.populate_tasks(db, tasks, fields)
+    
+    @staticmethod
+    async def prefix_search_tasks(
+        db,
+        filter_criteria: Dict[str, Any],
+        prefix: str,
+        limit: int = 20,
+        after: Optional[Dict[str, Any]] = None,
+        fields: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find tasks whose title starts with a prefix, for type-ahead.
+        
+        Matching is case-insensitive on the stored `title_key`. The
+        anchored, escaped pattern becomes a range on the title prefix
+        index, and results come back in index order `(title_key, _id)`,
+        so a page reads about `limit` index keys for Admins. Sub-Admin
+        and Member scopes are filtered on the same index keys.
+        
+        Args:
+            db: Database instance
+            filter_criteria: MongoDB filter (from RBAC dependency); must
+                include `team_id`
+            prefix: Beginning of the title, as typed
+            limit: Maximum number of results
+            after: `title_key` and `_id` of the last result of the previous page
+            fields: Optional response fields to fetch and populate
+        
+        Returns:
+            List of task documents ordered by title
+        """
+        query = {
+            **filter_criteria,
+            "title_key": {"$regex": "^" + re.escape(TaskModel.title_key(prefix))},
+        }
+        if after is not None:
+            query["$or"] = [
+                {"title_key": {"$gt": after["title_key"]}},
+                {"title_key": after["title_key"], "_id": {"$gt": after["_id"]}},
+            ]
+        
+        projection = None
+        if fields:
+            projection = {**build_projection(fields, TASK_POPULATED_FIELDS), "title_key": 1}
+        
+        tasks = await db[TASKS_COLLECTION].find(
+            query, projection
+        ).sort([("title_key", 1), ("_id", 1)]).limit(limit).to_list(length=limit)
+        
+        return await TaskService.populate_tasks(db, tasks, fields)
+    
+    @staticmethod
+    async def list_assigned_tasks(
+        db,
+        user_id: ObjectId,
+        team_ids: List[ObjectId],
+        statuses: Optional[List[TaskStatus]] = None,
+        limit: int = 50,
+        after: Optional[Dict[str, Any]] = None,
+        fields: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List a user's assigned tasks across teams, most recently updated first.
+        
+        Served by the `(assigned_to, status, updated_at, _id, team_id)`
+        index: the statuses are always matched with `$in`, so each status
+        range is read in `updated_at` order and the ranges are merged
+        without an in-memory sort, and tasks of other teams are dropped
+        on index keys. Results are ordered by `(updated_at desc, _id desc)`,
+        which is also the keyset cursor for the next page.
+        
+        Args:
+            db: Database instance
+            user_id: Assignee User ObjectId
+            team_ids: Teams the user is an active member of
+            statuses: Optional statuses to include (default all)
+            limit: Maximum number of tasks to return
+            after: `updated_at` and `_id` of the last task of the previous page
+            fields: Optional response fields to fetch and populate
+        
+        Returns:
+            List of task documents
+        """
+        query: Dict[str, Any] = {
+            "assigned_to": user_id,
+            "status": {"$in": [s.value for s in statuses or TaskStatus]},
+            "team_id": {"$in": team_ids},
+        }
+        if after is not None:
+            query["$or"] = [
+                {"updated_at": {"$lt": after["updated_at"]}},
+                {"updated_at": after["updated_at"], "_id": {"$lt": after["_id"]}},
+            ]
+        
+        projection = None
+        if fields:
+            projection = {**build_projection(fields, TASK_POPULATED_FIELDS), "updated_at": 1}
+        
+        tasks = await db[TASKS_COLLECTION].find(
+            query, projection
+        ).sort([("updated_at", -1), ("_id", -1)]).limit(limit).to_list(length=limit)
+        
+        return await TaskService.populate_tasks(db, tasks, fields)
+    
+    @staticmethod
+    async def list_changes(
+        db,
+        filter_criteria: Dict[str, Any],
+        position: Optional[Dict[str, Any]] = None,
+        limit: int = 500
+    ) -> Dict[str, Any]:
+        """
+        Get the tasks written and deleted since a sync position.
+        
+        Tasks are read in `(updated_at, _id)` order from the
+        `(team_id, updated_at, _id, ...)` index and tombstones in
+        `(deleted_at, _id)` order from theirs, up to `limit` of each. A
+        stream that filled its page continues right after its last entry;
+        one that did not continues from TASK_SYNC_OVERLAP_SECONDS ago, so
+        writes that commit late are still picked up (clients may see an
+        entry twice).
+        
+        Tombstones match the visibility the task had before its removal,
+        so a reassigned or re-managed task is reported to everyone who
+        could see it; the ids the caller can still see are dropped with
+        one `$in` query.
+        
+        Args:
+            db: Database instance
+            filter_criteria: MongoDB filter (from RBAC dependency); must
+                include `team_id`
+            position: `updated_at`/`task_id` and `deleted_at`/`tombstone_id`
+                reached by the previous sync (a None id includes everything
+                at that time), or None to start a full sync
+            limit: Maximum number of tasks, and of tombstones, to return
+        
+        Returns:
+            Dictionary with the populated `tasks`, the `deleted` task ids,
+            the next `position` and whether more changes are waiting
+            (`has_more`)
+        """
+        resume_at = datetime.utcnow() - timedelta(seconds=settings.TASK_SYNC_OVERLAP_SECONDS)
+        if position is None:
+            # Every current task, and deletions from here on
+            position = {"updated_at": datetime(1970, 1, 1), "task_id": None, "deleted_at": resume_at, "tombstone_id": None}
+        
+        tasks, tombstones = await asyncio.gather(
+            TaskService._read_since(
+                db, TASKS_COLLECTION, filter_criteria, limit,
+                "updated_at", position["updated_at"], position["task_id"]
+            ),
+            TaskService._read_since(
+                db, TASK_TOMBSTONES_COLLECTION, filter_criteria, limit,
+                "deleted_at", position["deleted_at"], position["tombstone_id"],
+                projection={"task_id": 1, "deleted_at": 1}
+            )
+        )
+        
+        # Tombstones written before `task_id` existed used the task's id
+        removed = list(dict.fromkeys(tombstone.get("task_id", tombstone["_id"]) for tombstone in tombstones))
+        still_visible = set()
+        if removed:
+            still_visible = {task["_id"] for task in await db[TASKS_COLLECTION].find(
+                {**filter_criteria, "_id": {"$in": removed}},
+                {"_id": 1}
+            ).to_list(length=None)}
+        
+        next_position, has_more = {}, False
+        for documents, time_key, id_key in ((tasks, "updated_at", "task_id"), (tombstones, "deleted_at", "tombstone_id")):
+            if len(documents) >= limit:
+                next_position[time_key] = documents[-1][time_key]
+                next_position[id_key] = documents[-1]["_id"]
+                has_more = True
+            else:
+                next_position[time_key] = max(position[time_key], resume_at)
+                next_position[id_key] = None
+        
+        return {
+            "tasks": await TaskService.populate_tasks(db, tasks),
+            "deleted": [task_id for task_id in removed if task_id not in still_visible],
+            "position": next_position,
+            "has_more": has_more,
+        }
+    
+    @staticmethod
+    async def _read_since(
+        db,
+        collection: str,
+        filter_criteria: Dict[str, Any],
+        limit: int,
+        field: str,
+        since: datetime,
+        after: Optional[ObjectId],
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Read documents in `(field, _id)` order, from `since` on.
+        
+        With `after`, documents at exactly `since` are only included past
+        that `_id`.
+        """
+        if after is None:
+            query = {**filter_criteria, field: {"$gte": since}}
+        else:
+            query = {**filter_criteria, "$or": [
+                {field: {"$gt": since}},
+                {field: since, "_id": {"$gt": after}},
+            ]}
+        
+        return await db[collection].find(
+            query, projection
+        ).sort([(field, 1), ("_id", 1)]).limit(limit).to_list(length=limit)
+    
+    @staticmethod
+    async def get_task_stats(
+        db,
+        team_id: ObjectId,
+        scope: str,
+        filter_criteria: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Count tasks by status, priority and assignee.
+        
+        Reads the team's incrementally maintained counters (one document,
+        regardless of team size) and selects the caller's scope. Results
+        are cached per team and visibility scope for
+        TASK_STATS_CACHE_TTL_SECONDS.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+            scope: Caller's visibility scope (see `visibility_scope`)
+            filter_criteria: MongoDB filter (from RBAC dependency)
+            
+        Returns:
+            Dictionary with `total`, `by_status`, `by_priority` and
+            `by_assignee` counts
+        """
+        cache_key = (team_id, scope)
+        stats = task_stats_cache.get(cache_key)
+        if stats is not None:
+            return stats
+        
+        team_stats = await TeamStatsService.get_stats(db, team_id)
+        stats = {"team_id": team_id, **TeamStatsService.scope_stats(team_stats, filter_criteria)}
+        
+        task_stats_cache.set(cache_key, stats)
+        return stats
+    
+    @staticmethod
+    async def iter_task_batches(
+        db,
+        filter_criteria: Dict[str, Any],
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream every task matching the filter in populated batches.
+        
+        Walks a single cursor in `_id` order, so only one batch is held in
+        memory at a time regardless of how many tasks match.
+        
+        Args:
+            db: Database instance
+            filter_criteria: MongoDB filter (from RBAC dependency)
+            batch_size: Number of tasks per batch
             
-            # Get creator name
-            creator = await db[USERS_COLLECTION].find_one({"_id": task["created_by"]})
-            if creator:
-                task["created_by_name"] = creator["full_name"]
+        Yields:
+            Lists of populated task documents
+        """
+        cursor = db[TASKS_COLLECTION].find(filter_criteria).sort("_id", 1).batch_size(batch_size)
+        
+        batch = []
+        async for task in cursor:
+            batch.append(task)
+            if len(batch) >= batch_size:
+                yield await TaskService.populate_tasks(db, batch)
+                batch = []
+        
+        if batch:
+            yield await TaskService.populate_tasks(db, batch)
+    
+    @staticmethod
+    async def populate_tasks(
+        db,
+        tasks: List[Dict[str, Any]],
+        fields: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Attach assignee, creator and team names to a page of tasks.
+        
+        All distinct users on the page are resolved with one `$in`
+        query and teams come from the team cache, so the number of round
+        trips does not grow with the page size. Lookups for names that are not in
+        `fields` are skipped.
+        
+        Args:
+            db: Database instance
+            tasks: Task documents to populate in place
+            fields: Optional response fields requested by the caller
             
-            # Get team name
-            team = await db[TEAMS_COLLECTION].find_one({"_id": task["team_id"]})
-            if team:
-                task["team_name"] = team["name"]
+        Returns:
+            The same list of task documents
+        """
+        names = [
+            name for name in TASK_POPULATED_FIELDS
+            if fields is None or name in fields
+        ]
+        if not tasks or not names:
+            return tasks
+        
+        user_fields = [name for name in names if name != "team_name"]
+        user_ids = {
+            task[TASK_POPULATED_FIELDS[name]]
+            for task in tasks for name in user_fields
+        }
+        team_ids = {task["team_id"] for task in tasks} if "team_name" in names else set()
+        
+        users, teams = await asyncio.gather(
+            TaskService._find_by_ids(db, USERS_COLLECTION, user_ids, "full_name"),
+            TeamService.get_teams(db, team_ids)
+        )
+        lookups = {name: users for name in user_fields}
+        lookups["team_name"] = {team_id: team["name"] for team_id, team in teams.items()}
+        
+        for task in tasks:
+            for name in names:
+                value = lookups[name].get(task[TASK_POPULATED_FIELDS[name]])
+                if value is not None:
+                    task[name] = value
         
         return tasks
     
+    @staticmethod
+    async def _find_by_ids(db, collection: str, ids: set, field: str) -> Dict[ObjectId, Any]:
+        """
+        Resolve one field for a set of document ids with a single `$in` query.
+        
+        Returns:
+            Mapping of `_id` to the field value (empty when `ids` is empty)
+        """
+        if not ids:
+            return {}
+        
+        documents = await db[collection].find(
+            {"_id": {"$in": list(ids)}},
+            {field: 1}
+        ).to_list(length=None)
+        
+        return {d["_id"]: d[field] for d in documents}
+    
     @staticmethod
     async def update_task(
         db,
@@ -131,7 +609,8 @@ class TaskService:
         title: Optional[str] = None,
         description: Optional[str] = None,
         status: Optional[TaskStatus] = None,
-        priority: Optional[TaskPriority] = None
+        priority: Optional[TaskPriority] = None,
+        filter_criteria: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Update task information.
@@ -143,14 +622,47 @@ class TaskService:
             description: Optional new description
             status: Optional new status
             priority: Optional new priority
+            filter_criteria: Optional permission filter the task must match
             
         Returns:
-            Updated task document or None if not found
+            Updated task document or None if not found (or not permitted)
+        """
+        update_data = TaskService.build_update(title, description, status, priority)
+        
+        # The previous values are needed for the stats deltas
+        before = await db[TASKS_COLLECTION].find_one_and_update(
+            {**(filter_criteria or {}), "_id": task_id},
+            {"$set": update_data},
+            return_document=ReturnDocument.BEFORE
+        )
+        if not before:
+            return None
+        
+        result = {**before, **update_data}
+        await TeamStatsService.record(db, changed=[(before, result)])
+        await TeamVersionService.bump(db, result["team_id"])
+        await events.event_hub.publish(events.TASK_UPDATED, result["team_id"], task=result, previous=before)
+        
+        return result
+    
+    @staticmethod
+    def build_update(
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the `$set` document for a task update.
+        
+        Returns:
+            Fields to set, always including a fresh `updated_at`
         """
         update_data = {"updated_at": datetime.utcnow()}
         
         if title is not None:
             update_data["title"] = title
+            update_data["title_key"] = TaskModel.title_key(title)
         if description is not None:
             update_data["description"] = description
         if status is not None:
@@ -158,66 +670,222 @@ class TaskService:
         if priority is not None:
             update_data["priority"] = priority.value
         
-        result = await db[TASKS_COLLECTION].find_one_and_update(
-            {"_id": task_id},
-            {"$set": update_data},
-            return_document=True
-        )
+        return update_data
+    
+    @staticmethod
+    async def update_tasks(
+        db,
+        updates: List[Tuple[ObjectId, Dict[str, Any]]],
+        filter_criteria: Dict[str, Any]
+    ) -> List[bool]:
+        """
+        Apply many task updates under one permission filter.
         
-        return result
+        Each update is written with its own `find_one_and_update`, carrying
+        the filter so a task that changes hands in between is left alone,
+        and returning the task's previous values for the stats deltas. Up
+        to `BULK_WRITE_BATCH_SIZE` tasks are written concurrently; updates
+        to the same task run one after another, in request order.
+        
+        Args:
+            db: Database instance
+            updates: (task_id, `$set` document) pairs, see `build_update`
+            filter_criteria: Permission filter every task must match
+            
+        Returns:
+            Whether each update matched a task, in request order
+        """
+        by_task: Dict[ObjectId, List[int]] = {}
+        for index, (task_id, _) in enumerate(updates):
+            by_task.setdefault(task_id, []).append(index)
+        
+        previous: List[Optional[Dict[str, Any]]] = [None] * len(updates)
+        groups = list(by_task.values())
+        for start in range(0, len(groups), BULK_WRITE_BATCH_SIZE):
+            await asyncio.gather(*(
+                TaskService._update_in_order(db, updates, indexes, filter_criteria, previous)
+                for indexes in groups[start:start + BULK_WRITE_BATCH_SIZE]
+            ))
+        
+        # Stats deltas from the values each write replaced, in request order
+        changed = [
+            (before, {**before, **update_data})
+            for (_, update_data), before in zip(updates, previous)
+            if before
+        ]
+        await TeamStatsService.record(db, changed=changed)
+        
+        await asyncio.gather(*(
+            TeamVersionService.bump(db, team_id)
+            for team_id in {after["team_id"] for _, after in changed}
+        ))
+        for before, after in changed:
+            await events.event_hub.publish(events.TASK_UPDATED, after["team_id"], task=after, previous=before)
+        
+        return [before is not None for before in previous]
+    
+    @staticmethod
+    async def _update_in_order(
+        db,
+        updates: List[Tuple[ObjectId, Dict[str, Any]]],
+        indexes: List[int],
+        filter_criteria: Dict[str, Any],
+        previous: List[Optional[Dict[str, Any]]]
+    ) -> None:
+        """
+        Write one task's updates in order, recording the full task each
+        replaced; the updated task published to event subscribers is
+        built from it.
+        """
+        for index in indexes:
+            task_id, update_data = updates[index]
+            previous[index] = await db[TASKS_COLLECTION].find_one_and_update(
+                {**filter_criteria, "_id": task_id},
+                {"$set": update_data},
+                return_document=ReturnDocument.BEFORE
+            )
+    
+    @staticmethod
+    async def record_removals(db, tasks: List[Dict[str, Any]]) -> None:
+        """
+        Leave tombstones for tasks that were deleted or left some users'
+        visibility, so delta sync can report them.
+        
+        Args:
+            db: Database instance
+            tasks: Task documents as they were before the removal
+        """
+        if tasks:
+            await db[TASK_TOMBSTONES_COLLECTION].insert_many(
+                [TaskTombstoneModel.create_document(task) for task in tasks],
+                ordered=False
+            )
+    
+    @staticmethod
+    async def find_existing_ids(db, task_ids: List[ObjectId]) -> Set[ObjectId]:
+        """
+        Return which of the given task ids exist, with a single `$in` query.
+        """
+        if not task_ids:
+            return set()
+        
+        tasks = await db[TASKS_COLLECTION].find(
+            {"_id": {"$in": task_ids}},
+            {"_id": 1}
+        ).to_list(length=None)
+        
+        return {task["_id"] for task in tasks}
     
     @staticmethod
     async def assign_task(
         db,
         task_id: ObjectId,
         assigned_to: ObjectId,
-        team_id: ObjectId
+        team_id: Optional[ObjectId] = None,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        managers: Optional[Dict[ObjectId, List[ObjectId]]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Reassign a task to a different user.
         
+        Either pass `team_id` to verify the new assignee's membership
+        first, or a `filter_criteria` that already restricts the task to
+        teams the assignee belongs to (see `task_assign_filter`) together
+        with the assignee's management chain in each of those teams.
+        
         Args:
             db: Database instance
             task_id: Task ObjectId
             assigned_to: New assignee User ObjectId
-            team_id: Team ObjectId for validation
+            team_id: Optional Team ObjectId for validation
+            filter_criteria: Optional permission filter the task must match
+            managers: Assignee's membership `ancestors` keyed by team_id
             
         Returns:
-            Updated task document or None if not found
+            Updated task document or None if not found (or not permitted)
             
         Raises:
             ValueError: If new assignee is not a member of the team
         """
-        # Verify new assignee is a member of the team
-        assignee_membership = await db[MEMBERSHIPS_COLLECTION].find_one({
-            "user_id": assigned_to,
-            "team_id": team_id
-        })
-        if not assignee_membership:
-            raise ValueError("Assigned user is not a member of this team")
+        if team_id is not None:
+            # Verify new assignee is a member of the team
+            assignee_membership = await db[MEMBERSHIPS_COLLECTION].find_one({
+                "user_id": assigned_to,
+                "team_id": team_id
+            })
+            if not assignee_membership:
+                raise ValueError("Assigned user is not a member of this team")
+            managers = {team_id: assignee_membership.get("ancestors") or []}
         
-        result = await db[TASKS_COLLECTION].find_one_and_update(
-            {"_id": task_id},
-            {"$set": {
-                "assigned_to": assigned_to,
-                "updated_at": datetime.utcnow()
-            }},
-            return_document=True
+        update_data = {
+            "assigned_to": assigned_to,
+            "updated_at": datetime.utcnow()
+        }
+        
+        chains = {tuple(chain) for chain in (managers or {}).values()}
+        if len(chains) <= 1:
+            update_data["manager_ids"] = list(chains.pop()) if chains else []
+            update = {"$set": update_data}
+        else:
+            # The task may be in any of several teams; pick the chain by team
+            update_data["manager_ids"] = {"$switch": {
+                "branches": [
+                    {"case": {"$eq": ["$team_id", tid]}, "then": {"$literal": chain}}
+                    for tid, chain in managers.items()
+                ],
+                "default": []
+            }}
+            update = [{"$set": update_data}]
+        
+        # The previous values are needed for the stats deltas
+        before = await db[TASKS_COLLECTION].find_one_and_update(
+            {**(filter_criteria or {}), "_id": task_id},
+            update,
+            return_document=ReturnDocument.BEFORE
         )
+        if not before:
+            return None
+        
+        result = {
+            **before,
+            **update_data,
+            "manager_ids": managers.get(before["team_id"], []) if managers else []
+        }
+        # The previous assignee and managers may no longer see the task
+        if (before["assigned_to"], before.get("manager_ids") or []) != (result["assigned_to"], result["manager_ids"]):
+            await TaskService.record_removals(db, [before])
+        await TeamStatsService.record(db, changed=[(before, result)])
+        await TeamVersionService.bump(db, result["team_id"])
+        await events.event_hub.publish(events.TASK_ASSIGNED, result["team_id"], task=result, previous=before)
         
         return result
     
     @staticmethod
-    async def delete_task(db, task_id: ObjectId) -> bool:
+    async def delete_task(
+        db,
+        task_id: ObjectId,
+        filter_criteria: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """
-        Delete a task.
+        Delete a task, leaving a tombstone for delta sync.
         
         Args:
             db: Database instance
             task_id: Task ObjectId
+            filter_criteria: Optional permission filter the task must match
             
         Returns:
-            True if deleted, False if not found
+            True if deleted, False if not found (or not permitted)
         """
-        result = await db[TASKS_COLLECTION].delete_one({"_id": task_id})
-        return result.deleted_count > 0
+        deleted = await db[TASKS_COLLECTION].find_one_and_delete(
+            {**(filter_criteria or {}), "_id": task_id},
+            projection={"team_id": 1, "status": 1, "priority": 1, "assigned_to": 1, "manager_ids": 1}
+        )
+        if not deleted:
+            return False
+        
+        await TaskService.record_removals(db, [deleted])
+        await TeamStatsService.record(db, deleted=[deleted])
+        await TeamVersionService.bump(db, deleted["team_id"])
+        await events.event_hub.publish(events.TASK_DELETED, deleted["team_id"], task=deleted)
+        return True
@@ -0,0 +1,295 @@
+"""
+Team deletion service.
+Deletes teams in the background: the team is hidden right away, then an
+in-process worker removes its tasks and memberships in throttled batches.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from app.core import events
+from app.core.config import settings
+from app.models.job import JobModel, JobStatus, JobType
+from app.services.permission_service import PermissionService, permission_cache
+from app.services.team_service import team_cache
+from app.db.collections import (
+    JOBS_COLLECTION,
+    TEAMS_COLLECTION,
+    MEMBERSHIPS_COLLECTION,
+    TASKS_COLLECTION,
+    TEAM_VERSIONS_COLLECTION,
+    TEAM_STATS_COLLECTION,
+)
+
+
+# How long a worker holds a job before another worker may take it over
+JOB_LEASE_SECONDS = 60
+
+# Collections emptied by a team deletion, in order; the team document goes last
+CASCADE_COLLECTIONS = (TASKS_COLLECTION, MEMBERSHIPS_COLLECTION)
+
+# Running workers, referenced so they are not garbage collected mid-run
+_workers: Set[asyncio.Task] = set()
+
+
+class TeamDeletionService:
+    """Service for background team deletion."""
+    
+    @staticmethod
+    async def start(db, team_id: ObjectId, requested_by: ObjectId) -> Optional[Dict[str, Any]]:
+        """
+        Mark a team as deleting and schedule the cascade.
+        
+        Memberships are flagged `team_deleting` in the same request, so
+        every membership-gated read and write stops seeing the team before
+        the worker has deleted anything.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+            requested_by: User ObjectId of the admin deleting the team
+        
+        Returns:
+            Job document, or None if the team doesn't exist or is already
+            being deleted
+        """
+        job_id = ObjectId()
+        team = await db[TEAMS_COLLECTION].find_one_and_update(
+            {"_id": team_id, "deleting_at": {"$exists": False}},
+            {"$set": {
+                "deleting_at": datetime.utcnow(),
+                "deleted_by": requested_by,
+                "deletion_job_id": job_id
+            }}
+        )
+        if not team:
+            return None
+        team_cache.invalidate(team_id)
+        
+        job = await TeamDeletionService._ensure_job(db, job_id, team_id, requested_by)
+        await TeamDeletionService._hide_memberships(db, team_id)
+        await PermissionService.record_change(db, team_id)
+        await events.event_hub.publish(events.TEAM_DELETED, team_id)
+        
+        TeamDeletionService.schedule(db, job_id)
+        return job
+    
+    @staticmethod
+    async def get_job(db, job_id: ObjectId) -> Optional[Dict[str, Any]]:
+        """
+        Get a background job by ID.
+        
+        Args:
+            db: Database instance
+            job_id: Job ObjectId
+        
+        Returns:
+            Job document or None if not found
+        """
+        return await db[JOBS_COLLECTION].find_one({"_id": job_id})
+    
+    @staticmethod
+    async def resume_pending(db) -> int:
+        """
+        Schedule every team deletion that has not finished.
+        Should be called once on application startup, after migrations.
+        
+        Covers teams still marked deleting (recording the job first if the
+        previous process stopped before it could) and unfinished jobs whose
+        team document is already gone.
+        
+        Args:
+            db: Database instance
+        
+        Returns:
+            Number of deletions scheduled
+        """
+        teams = await db[TEAMS_COLLECTION].find(
+            {"deleting_at": {"$exists": True}},
+            {"deleted_by": 1, "deletion_job_id": 1}
+        ).to_list(length=None)
+        
+        for team in teams:
+            await TeamDeletionService._ensure_job(
+                db, team["deletion_job_id"], team["_id"], team["deleted_by"]
+            )
+        
+        jobs = await db[JOBS_COLLECTION].find(
+            {
+                "type": JobType.TEAM_DELETE.value,
+                "status": {"$in": [JobStatus.PENDING.value, JobStatus.RUNNING.value]}
+            },
+            {"_id": 1}
+        ).to_list(length=None)
+        
+        for job in jobs:
+            TeamDeletionService.schedule(db, job["_id"])
+        
+        if jobs:
+            print(f"✓ Resumed {len(jobs)} team deletion(s)")
+        return len(jobs)
+    
+    @staticmethod
+    def schedule(db, job_id: ObjectId) -> None:
+        """
+        Run a deletion job in the background on the current event loop.
+        
+        Args:
+            db: Database instance
+            job_id: Job ObjectId
+        """
+        worker = asyncio.create_task(TeamDeletionService._run_safely(db, job_id))
+        _workers.add(worker)
+        worker.add_done_callback(_workers.discard)
+    
+    @staticmethod
+    async def shutdown() -> None:
+        """
+        Stop running workers; their jobs resume on the next startup.
+        Should be called on application shutdown, before closing MongoDB.
+        """
+        workers = list(_workers)
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    
+    @staticmethod
+    async def run(db, job_id: ObjectId) -> None:
+        """
+        Claim a deletion job and run it to completion.
+        
+        Each batch deletes one `_id` range of the team's documents, found
+        through the `(team_id, _id)` prefix, then records progress, renews
+        the lease and sleeps for TEAM_DELETE_BATCH_DELAY_SECONDS to spread
+        the write load. Deleted ranges are gone, so a resumed job simply
+        starts at the team's lowest remaining `_id`.
+        
+        Args:
+            db: Database instance
+            job_id: Job ObjectId
+        """
+        job = await TeamDeletionService._claim(db, job_id)
+        if not job:
+            return
+        
+        team_id = job["team_id"]
+        await TeamDeletionService._hide_memberships(db, team_id)
+        
+        for collection in CASCADE_COLLECTIONS:
+            while True:
+                batch = await db[collection].find(
+                    {"team_id": team_id},
+                    {"_id": 1}
+                ).sort("_id", 1).limit(settings.TEAM_DELETE_BATCH_SIZE).to_list(length=None)
+                if not batch:
+                    break
+                
+                result = await db[collection].delete_many({
+                    "team_id": team_id,
+                    "_id": {"$gte": batch[0]["_id"], "$lte": batch[-1]["_id"]}
+                })
+                
+                now = datetime.utcnow()
+                await db[JOBS_COLLECTION].update_one(
+                    {"_id": job_id},
+                    {
+                        "$inc": {f"progress.{collection}": result.deleted_count},
+                        "$set": {
+                            "updated_at": now,
+                            "lease_expires_at": now + timedelta(seconds=JOB_LEASE_SECONDS)
+                        }
+                    }
+                )
+                await asyncio.sleep(settings.TEAM_DELETE_BATCH_DELAY_SECONDS)
+        
+        await db[TEAMS_COLLECTION].delete_one({"_id": team_id})
+        team_cache.invalidate(team_id)
+        permission_cache.invalidate(team_id)
+        await db[TEAM_VERSIONS_COLLECTION].delete_one({"_id": team_id})
+        await db[TEAM_STATS_COLLECTION].delete_one({"_id": team_id})
+        
+        now = datetime.utcnow()
+        await db[JOBS_COLLECTION].update_one(
+            {"_id": job_id},
+            {"$set": {
+                "status": JobStatus.DONE.value,
+                "lease_expires_at": None,
+                "updated_at": now,
+                "finished_at": now
+            }}
+        )
+    
+    @staticmethod
+    async def _run_safely(db, job_id: ObjectId) -> None:
+        """Run a job, reporting failures; the job resumes on the next startup."""
+        try:
+            await TeamDeletionService.run(db, job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"✗ Team deletion job {job_id} failed: {e}")
+    
+    @staticmethod
+    async def _claim(db, job_id: ObjectId) -> Optional[Dict[str, Any]]:
+        """
+        Take the lease on an unfinished job.
+        
+        When another worker holds the lease (possibly one that died before
+        a restart), waits for it to expire and tries again.
+        
+        Returns:
+            Claimed job document, or None once the job is finished or gone
+        """
+        while True:
+            now = datetime.utcnow()
+            job = await db[JOBS_COLLECTION].find_one_and_update(
+                {
+                    "_id": job_id,
+                    "status": {"$ne": JobStatus.DONE.value},
+                    "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lt": now}}]
+                },
+                {"$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "lease_expires_at": now + timedelta(seconds=JOB_LEASE_SECONDS),
+                    "updated_at": now
+                }},
+                return_document=ReturnDocument.AFTER
+            )
+            if job:
+                return job
+            
+            current = await db[JOBS_COLLECTION].find_one({"_id": job_id}, {"status": 1})
+            if not current or current["status"] == JobStatus.DONE.value:
+                return None
+            await asyncio.sleep(JOB_LEASE_SECONDS)
+    
+    @staticmethod
+    async def _ensure_job(
+        db,
+        job_id: ObjectId,
+        team_id: ObjectId,
+        requested_by: ObjectId
+    ) -> Dict[str, Any]:
+        """Create the job document for a deletion unless it already exists."""
+        job = JobModel.create_document(
+            JobType.TEAM_DELETE,
+            team_id,
+            requested_by,
+            progress={collection: 0 for collection in CASCADE_COLLECTIONS}
+        )
+        return await db[JOBS_COLLECTION].find_one_and_update(
+            {"_id": job_id},
+            {"$setOnInsert": job},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    
+    @staticmethod
+    async def _hide_memberships(db, team_id: ObjectId) -> None:
+        """Flag a team's memberships so RBAC lookups skip the team."""
+        await db[MEMBERSHIPS_COLLECTION].update_many(
+            {"team_id": team_id, "team_deleting": {"$ne": True}},
+            {"$set": {"team_deleting": True}}
+        )
@@ -2,12 +2,26 @@
 Team service.
 Handles team CRUD operations.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from bson import ObjectId
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.models.team import TeamModel
-from app.models.membership import MembershipModel, Role
-from app.db.collections import TEAMS_COLLECTION, MEMBERSHIPS_COLLECTION, TASKS_COLLECTION
+from app.models.membership import MembershipModel, Role, ACTIVE_MEMBERSHIP_FILTER
+from app.services.team_version_service import TeamVersionService
+from app.services.permission_service import PermissionService
+from app.services.team_stats_service import TeamStatsService
+from app.db.collections import TEAMS_COLLECTION, MEMBERSHIPS_COLLECTION
+
+
+# Per-worker team directory, keyed by team ObjectId. Entries are shared
+# between requests and must not be mutated.
+team_cache = TTLCache(
+    "teams",
+    maxsize=settings.TEAM_CACHE_MAX_SIZE,
+    ttl=settings.TEAM_CACHE_TTL_SECONDS
+)
 
 
 class TeamService:
@@ -51,56 +65,104 @@ class TeamService:
         )
         await db[MEMBERSHIPS_COLLECTION].insert_one(membership_doc)
         
+        await TeamStatsService.initialize(db, team_doc["_id"])
+        await PermissionService.record_change(db, team_doc["_id"])
+        
         return team_doc
     
     @staticmethod
     async def get_team(db, team_id: ObjectId) -> Optional[Dict[str, Any]]:
         """
-        Get team by ID.
+        Get team by ID, from the team cache when possible.
         
         Args:
             db: Database instance
             team_id: Team ObjectId
             
         Returns:
-            Team document or None if not found
+            Team document (shared; do not mutate) or None if not found
         """
-        return await db[TEAMS_COLLECTION].find_one({"_id": team_id})
+        teams = await TeamService.get_teams(db, [team_id])
+        return teams.get(team_id)
     
     @staticmethod
-    async def list_user_teams(db, user_id: ObjectId) -> List[Dict[str, Any]]:
+    async def get_teams(db, team_ids: Iterable[ObjectId]) -> Dict[ObjectId, Dict[str, Any]]:
         """
-        List all teams a user belongs to.
+        Get many teams by ID, from the team cache when possible.
+        
+        Teams missing from the cache are read with one `$in` query and
+        cached for TEAM_CACHE_TTL_SECONDS. Team writes on this worker
+        invalidate the cache; other workers see them within the TTL.
         
         Args:
             db: Database instance
-            user_id: User ObjectId
+            team_ids: Team ObjectIds
             
         Returns:
-            List of team documents with user's role
+            Team documents (shared; do not mutate) keyed by id; unknown
+            ids are left out
         """
-        # Find all memberships for the user
-        memberships = await db[MEMBERSHIPS_COLLECTION].find({
-            "user_id": user_id
-        }).to_list(length=None)
+        teams = {}
+        missing = []
+        for team_id in set(team_ids):
+            team = team_cache.get(team_id)
+            if team is None:
+                missing.append(team_id)
+            else:
+                teams[team_id] = team
+        
+        if missing:
+            async for team in db[TEAMS_COLLECTION].find({"_id": {"$in": missing}}):
+                team_cache.set(team["_id"], team)
+                teams[team["_id"]] = team
         
-        if not memberships:
-            return []
-        
-        # Get team IDs
-        team_ids = [m["team_id"] for m in memberships]
-        
-        # Fetch teams
-        teams = await db[TEAMS_COLLECTION].find({
-            "_id": {"$in": team_ids}
-        }).to_list(length=None)
+        return teams
+    
+    @staticmethod
+    async def list_user_teams(
+        db,
+        user_id: ObjectId,
+        limit: int = 100,
+        after: Optional[ObjectId] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[ObjectId]]:
+        """
+        List one page of the teams a user belongs to, ordered by team id.
         
-        # Add user's role to each team
-        membership_map = {m["team_id"]: m["role"] for m in memberships}
-        for team in teams:
-            team["user_role"] = membership_map.get(team["_id"])
+        The page of memberships is read in order from the unique
+        `(user_id, team_id)` index, projected to the team id and role;
+        team documents then come from the team cache. A membership whose
+        team document is gone is skipped, so the page may hold fewer
+        teams than memberships.
         
-        return teams
+        Args:
+            db: Database instance
+            user_id: User ObjectId
+            limit: Maximum number of teams to return
+            after: Optional team id returned with the previous page
+            
+        Returns:
+            Team documents with user's role, and the team id of the page's
+            last membership to continue after (None on the last page)
+        """
+        query = {"user_id": user_id, **ACTIVE_MEMBERSHIP_FILTER}
+        if after is not None:
+            query["team_id"] = {"$gt": after}
+        
+        memberships = await db[MEMBERSHIPS_COLLECTION].find(
+            query,
+            {"_id": 0, "team_id": 1, "role": 1}
+        ).sort("team_id", 1).limit(limit).to_list(length=limit)
+        
+        teams = await TeamService.get_teams(db, [m["team_id"] for m in memberships])
+        
+        # Copies with the user's role, in membership order
+        page = [
+            {**teams[m["team_id"]], "user_role": m["role"]}
+            for m in memberships
+            if m["team_id"] in teams
+        ]
+        last = memberships[-1]["team_id"] if len(memberships) >= limit else None
+        return page, last
     
     @staticmethod
     async def update_team(
@@ -136,29 +198,8 @@ class TeamService:
             return_document=True
         )
         
-        return result
-    
-    @staticmethod
-    async def delete_team(db, team_id: ObjectId) -> bool:
-        """
-        Delete a team and all related data (memberships and tasks).
-        
-        Args:
-            db: Database instance
-            team_id: Team ObjectId
-            
-        Returns:
-            True if deleted, False if not found
-        """
-        # Delete team
-        result = await db[TEAMS_COLLECTION].delete_one({"_id": team_id})
-        if result.deleted_count == 0:
-            return False
-        
-        # Delete all memberships
-        await db[MEMBERSHIPS_COLLECTION].delete_many({"team_id": team_id})
+        team_cache.invalidate(team_id)
+        if result:
+            await TeamVersionService.bump(db, team_id)
         
-        # Delete all tasks
-        await db[TASKS_COLLECTION].delete_many({"team_id": team_id})
-        
-        return True
+        return result
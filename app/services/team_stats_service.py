@@ -0,0 +1,378 @@
+"""
+Team stats service.
+Maintains per-team task counters with atomic `$inc` deltas so dashboard
+counts are a single document read, and reconciles them from the tasks.
+"""
+import asyncio
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.models.task import TaskStatus, TaskPriority
+from app.services.lock_service import LockService
+from app.db.collections import TEAM_STATS_COLLECTION, TEAMS_COLLECTION, TASKS_COLLECTION
+
+
+# Running reconciliation loop, referenced so it is not garbage collected
+_reconciler: Optional[asyncio.Task] = None
+
+# Lock held by the worker running the periodic reconciliation
+RECONCILE_LOCK = "team_stats_reconcile"
+
+# Rebuilds tried per team before leaving it to the next reconciliation
+RECOMPUTE_ATTEMPTS = 3
+
+
+def _task_keys(task: Dict[str, Any]) -> List[str]:
+    """
+    List the counter paths a task contributes 1 to.
+    
+    Counts are kept for the whole team, per assignee and per Sub-Admin
+    in the assignee's management chain, which are the three task
+    visibility scopes.
+    """
+    status, priority = task["status"], task["priority"]
+    assignee = str(task["assigned_to"])
+    keys = [
+        "total",
+        f"by_status.{status}",
+        f"by_priority.{priority}",
+        f"by_assignee.{assignee}.total",
+        f"by_assignee.{assignee}.by_status.{status}",
+        f"by_assignee.{assignee}.by_priority.{priority}",
+    ]
+    
+    for manager in task.get("manager_ids") or []:
+        keys += [
+            f"by_manager.{manager}.total",
+            f"by_manager.{manager}.by_status.{status}",
+            f"by_manager.{manager}.by_priority.{priority}",
+            f"by_manager.{manager}.by_assignee.{assignee}",
+        ]
+    return keys
+
+
+def _expand(counts: Dict[str, int]) -> Dict[str, Any]:
+    """Turn dotted counter paths into a nested document."""
+    document: Dict[str, Any] = {}
+    for path, count in counts.items():
+        node = document
+        *parents, leaf = path.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = count
+    return document
+
+
+class TeamStatsService:
+    """Service for incrementally maintained team task counters."""
+    
+    @staticmethod
+    async def initialize(db, team_id: ObjectId) -> None:
+        """
+        Create the empty counters of a new team.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+        """
+        await db[TEAM_STATS_COLLECTION].update_one(
+            {"_id": team_id},
+            {"$setOnInsert": {"total": 0}},
+            upsert=True
+        )
+    
+    @staticmethod
+    async def record(
+        db,
+        created: Iterable[Dict[str, Any]] = (),
+        deleted: Iterable[Dict[str, Any]] = (),
+        changed: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]] = ()
+    ) -> None:
+        """
+        Apply the counter deltas of task writes, one `$inc` per team.
+        
+        Teams without a stats document are skipped; their counters are
+        computed from the tasks on the next read.
+        
+        Args:
+            db: Database instance
+            created: Inserted task documents
+            deleted: Deleted task documents (status, priority, assignee,
+                manager and team fields are enough)
+            changed: (before, after) pairs of updated task documents
+        """
+        deltas: Dict[ObjectId, Counter] = {}
+        
+        def add(task: Dict[str, Any], amount: int) -> None:
+            delta = deltas.setdefault(task["team_id"], Counter())
+            for key in _task_keys(task):
+                delta[key] += amount
+        
+        for task in created:
+            add(task, 1)
+        for task in deleted:
+            add(task, -1)
+        for before, after in changed:
+            add(before, -1)
+            add(after, 1)
+        
+        await TeamStatsService._apply(db, deltas)
+    
+    @staticmethod
+    async def move_managers(
+        db,
+        team_id: ObjectId,
+        chains: Dict[ObjectId, List[ObjectId]]
+    ) -> None:
+        """
+        Move members' task counts to their new management chains.
+        
+        Must be called before the tasks' `manager_ids` are rewritten. The
+        affected counts are read with one aggregation over the members'
+        tasks.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+            chains: New `manager_ids` keyed by assignee User ObjectId
+        """
+        groups = await db[TASKS_COLLECTION].aggregate([
+            {"$match": {"team_id": team_id, "assigned_to": {"$in": list(chains)}}},
+            {"$group": {
+                "_id": {
+                    "assigned_to": "$assigned_to",
+                    "manager_ids": "$manager_ids",
+                    "status": "$status",
+                    "priority": "$priority"
+                },
+                "count": {"$sum": 1}
+            }}
+        ]).to_list(length=None)
+        
+        delta = Counter()
+        for group in groups:
+            task = {**group["_id"], "team_id": team_id}
+            new_chain = chains[task["assigned_to"]]
+            if (task.get("manager_ids") or []) == new_chain:
+                continue
+            for key in _task_keys(task):
+                delta[key] -= group["count"]
+            for key in _task_keys({**task, "manager_ids": new_chain}):
+                delta[key] += group["count"]
+        
+        await TeamStatsService._apply(db, {team_id: delta})
+    
+    @staticmethod
+    async def get_stats(db, team_id: ObjectId) -> Dict[str, Any]:
+        """
+        Get a team's counters, computing them if they don't exist yet.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+        
+        Returns:
+            Team stats document
+        """
+        stats = await db[TEAM_STATS_COLLECTION].find_one({"_id": team_id})
+        if stats is None:
+            stats = await TeamStatsService.recompute(db, team_id)
+        return stats
+    
+    @staticmethod
+    def scope_stats(stats: Dict[str, Any], filter_criteria: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Select the counts of one visibility scope from a team's counters.
+        
+        Args:
+            stats: Team stats document
+            filter_criteria: Caller's visible-tasks filter (from RBAC)
+        
+        Returns:
+            Dictionary with `total`, `by_status`, `by_priority` and
+            `by_assignee` counts
+        """
+        if "manager_ids" in filter_criteria:
+            scope = stats.get("by_manager", {}).get(str(filter_criteria["manager_ids"]), {})
+            by_assignee = scope.get("by_assignee", {})
+        elif "assigned_to" in filter_criteria:
+            assignee = str(filter_criteria["assigned_to"])
+            scope = stats.get("by_assignee", {}).get(assignee, {})
+            by_assignee = {assignee: scope.get("total", 0)}
+        else:
+            scope = stats
+            by_assignee = {
+                user_id: counts.get("total", 0)
+                for user_id, counts in stats.get("by_assignee", {}).items()
+            }
+        
+        by_status = {s.value: 0 for s in TaskStatus}
+        by_status.update(scope.get("by_status", {}))
+        by_priority = {p.value: 0 for p in TaskPriority}
+        by_priority.update(scope.get("by_priority", {}))
+        
+        return {
+            "total": scope.get("total", 0),
+            "by_status": by_status,
+            "by_priority": by_priority,
+            "by_assignee": {user_id: count for user_id, count in by_assignee.items() if count},
+        }
+    
+    @staticmethod
+    async def recompute(db, team_id: ObjectId) -> Dict[str, Any]:
+        """
+        Rebuild a team's counters from its tasks, fixing any drift.
+        
+        Uses one grouped aggregation over the team's tasks, read through
+        the `team_id` prefix of the task indexes. Every `$inc` also bumps
+        the document's `counts_version`, so the rebuilt counters only
+        replace the document if no delta arrived since it was read before
+        the aggregation. Otherwise the rebuild is retried, up to
+        RECOMPUTE_ATTEMPTS times; a team whose writes keep racing is left
+        as it is for the next reconciliation.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+        
+        Returns:
+            The new team stats document, or the current one if every
+            attempt raced with a delta
+        """
+        for _ in range(RECOMPUTE_ATTEMPTS):
+            stored = await db[TEAM_STATS_COLLECTION].find_one({"_id": team_id})
+            
+            groups = await db[TASKS_COLLECTION].aggregate([
+                {"$match": {"team_id": team_id}},
+                {"$group": {
+                    "_id": {
+                        "assigned_to": "$assigned_to",
+                        "manager_ids": "$manager_ids",
+                        "status": "$status",
+                        "priority": "$priority"
+                    },
+                    "count": {"$sum": 1}
+                }}
+            ]).to_list(length=None)
+            
+            counts = Counter({"total": 0})
+            for group in groups:
+                for key in _task_keys(group["_id"]):
+                    counts[key] += group["count"]
+            
+            now = datetime.utcnow()
+            if stored is None:
+                stats = {"_id": team_id, **_expand(counts), "counts_version": 0, "recomputed_at": now}
+                try:
+                    await db[TEAM_STATS_COLLECTION].insert_one(stats)
+                    return stats
+                except DuplicateKeyError:
+                    continue
+            
+            # Documents written before counts_version existed match None
+            version = stored.get("counts_version")
+            stats = {"_id": team_id, **_expand(counts), "counts_version": version or 0, "recomputed_at": now}
+            result = await db[TEAM_STATS_COLLECTION].replace_one(
+                {"_id": team_id, "counts_version": version},
+                stats
+            )
+            if result.matched_count:
+                return stats
+        
+        return await db[TEAM_STATS_COLLECTION].find_one({"_id": team_id})
+    
+    @staticmethod
+    async def reconcile_all(
+        db,
+        delay: float = 0.0,
+        lease: Optional[Tuple[ObjectId, float]] = None
+    ) -> int:
+        """
+        Repair the management chains and recompute the counters of every
+        team that is not being deleted.
+        
+        Args:
+            db: Database instance
+            delay: Seconds to pause between teams
+            lease: Owner token and duration of a held RECONCILE_LOCK lease,
+                renewed after every team; the run stops if it is lost
+        
+        Returns:
+            Number of teams reconciled
+        """
+        # Imported here: membership changes record their stats through this module
+        from app.services.membership_service import MembershipService
+        
+        cursor = db[TEAMS_COLLECTION].find({"deleting_at": {"$exists": False}}, {"_id": 1})
+        
+        reconciled = 0
+        async for team in cursor:
+            await MembershipService.verify_chains(db, team["_id"])
+            await TeamStatsService.recompute(db, team["_id"])
+            reconciled += 1
+            if lease and not await LockService.renew(db, RECONCILE_LOCK, *lease):
+                break
+            if delay:
+                await asyncio.sleep(delay)
+        return reconciled
+    
+    @staticmethod
+    def start_reconciler(db) -> None:
+        """
+        Reconcile every team periodically in the background.
+        Runs every TEAM_STATS_RECONCILE_INTERVAL_SECONDS (0 disables it).
+        
+        Args:
+            db: Database instance
+        """
+        global _reconciler
+        if settings.TEAM_STATS_RECONCILE_INTERVAL_SECONDS > 0:
+            _reconciler = asyncio.create_task(TeamStatsService._reconcile_forever(db))
+    
+    @staticmethod
+    async def shutdown() -> None:
+        """Stop the reconciliation loop."""
+        if _reconciler is not None:
+            _reconciler.cancel()
+            await asyncio.gather(_reconciler, return_exceptions=True)
+    
+    @staticmethod
+    async def _reconcile_forever(db) -> None:
+        """
+        Sleep for the interval, then reconcile all teams, forever.
+        
+        Each round first takes RECONCILE_LOCK for a whole interval and
+        keeps it after finishing, so across all workers the teams are
+        reconciled once per interval, by one worker at a time.
+        """
+        interval = settings.TEAM_STATS_RECONCILE_INTERVAL_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                owner = await LockService.acquire(db, RECONCILE_LOCK, interval)
+                if owner is None:
+                    continue
+                await TeamStatsService.reconcile_all(
+                    db,
+                    delay=settings.TEAM_STATS_RECONCILE_DELAY_SECONDS,
+                    lease=(owner, interval)
+                )
+            except Exception as e:
+                print(f"✗ Team stats reconciliation failed: {e}")
+    
+    @staticmethod
+    async def _apply(db, deltas: Dict[ObjectId, Counter]) -> None:
+        """Send one `$inc` per team with non-zero deltas, bumping `counts_version`."""
+        updates = []
+        for team_id, delta in deltas.items():
+            increments = {key: amount for key, amount in delta.items() if amount}
+            if increments:
+                updates.append(db[TEAM_STATS_COLLECTION].update_one(
+                    {"_id": team_id},
+                    {"$inc": {**increments, "counts_version": 1}}
+                ))
+        await asyncio.gather(*updates)
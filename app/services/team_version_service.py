@@ -0,0 +1,65 @@
+"""
+Team version service.
+Maintains a per-team change counter used to validate cached list responses.
+"""
+from bson import ObjectId
+
+from app.db.collections import TEAM_VERSIONS_COLLECTION
+
+
+class TeamVersionService:
+    """Service for per-team data versions."""
+    
+    @staticmethod
+    async def bump(db, team_id: ObjectId, memberships: bool = False) -> None:
+        """
+        Record a change to a team's tasks, memberships or details.
+        
+        Must be called after every write that can change a team-scoped
+        list response.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+            memberships: Whether memberships changed; also bumps the
+                membership version that permission snapshots depend on
+        """
+        increments = {"version": 1}
+        if memberships:
+            increments["membership_version"] = 1
+        
+        await db[TEAM_VERSIONS_COLLECTION].update_one(
+            {"_id": team_id},
+            {"$inc": increments},
+            upsert=True
+        )
+    
+    @staticmethod
+    async def get_version(db, team_id: ObjectId) -> int:
+        """
+        Get the current version of a team.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+        
+        Returns:
+            Version number (0 if the team was never written to)
+        """
+        doc = await db[TEAM_VERSIONS_COLLECTION].find_one({"_id": team_id})
+        return doc["version"] if doc else 0
+    
+    @staticmethod
+    async def get_membership_version(db, team_id: ObjectId) -> int:
+        """
+        Get the version of a team's memberships.
+        
+        Args:
+            db: Database instance
+            team_id: Team ObjectId
+        
+        Returns:
+            Membership version (0 if memberships were never written to)
+        """
+        doc = await db[TEAM_VERSIONS_COLLECTION].find_one({"_id": team_id}, {"membership_version": 1})
+        return doc.get("membership_version", 0) if doc else 0
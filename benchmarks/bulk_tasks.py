@@ -0,0 +1,85 @@
+"""
+Benchmark: template instantiation and mass status changes.
+
+Compares creating and updating tasks one request at a time (membership
+check, assignee lookup and a single-document write per task) with the
+bulk create/update endpoints, and reports throughput in tasks/second.
+
+Usage:
+    python -m benchmarks.bulk_tasks [tasks]
+"""
+import asyncio
+import sys
+import time
+
+from app.dependencies.rbac import get_user_memberships, require_team_member, task_update_filter
+from app.models.task import TaskStatus
+from app.routes.tasks import create_tasks_bulk, update_tasks_bulk
+from app.schemas.task import TaskBulkCreate, TaskBulkUpdate
+from app.services.task_service import TaskService
+from benchmarks.common import get_bench_database, seed_team
+
+
+async def timed(fn) -> float:
+    """Run a coroutine function once and return the elapsed seconds."""
+    start = time.perf_counter()
+    await fn()
+    return time.perf_counter() - start
+
+
+async def main(count: int) -> None:
+    client, db = await get_bench_database()
+    seeded = await seed_team(db, members=50, tasks_per_member=1)
+    team_id = seeded["team_id"]
+    current_user = {"_id": seeded["admin_id"]}
+    member_ids = seeded["member_ids"]
+    
+    items = [
+        {"title": f"Template task {i}", "team_id": str(team_id), "assigned_to": str(member_ids[i % len(member_ids)])}
+        for i in range(count)
+    ]
+    created = []
+    
+    async def single_create():
+        for i, item in enumerate(items):
+            await require_team_member(item["team_id"], current_user, db)
+            task = await TaskService.create_task(
+                db, item["title"], team_id, member_ids[i % len(member_ids)], current_user["_id"]
+            )
+            created.append(task["_id"])
+    
+    async def bulk_create():
+        await create_tasks_bulk(TaskBulkCreate(tasks=items), current_user, db)
+    
+    async def single_update():
+        for task_id in created:
+            memberships = await get_user_memberships([current_user["_id"]], db)
+            await TaskService.update_task(
+                db, task_id, status=TaskStatus.DONE,
+                filter_criteria=task_update_filter(current_user, memberships[current_user["_id"]])
+            )
+    
+    async def bulk_update():
+        await update_tasks_bulk(
+            TaskBulkUpdate(tasks=[{"id": str(task_id), "status": TaskStatus.IN_PROGRESS} for task_id in created]),
+            current_user, db
+        )
+    
+    print(f"{count} tasks")
+    for label, single, bulk in (
+        ("create", single_create, bulk_create),
+        ("status change", single_update, bulk_update),
+    ):
+        single_seconds = await timed(single)
+        bulk_seconds = await timed(bulk)
+        print(
+            f"  {label:<14} single={count / single_seconds:9.0f} tasks/s  "
+            f"bulk={count / bulk_seconds:9.0f} tasks/s  speedup={single_seconds / bulk_seconds:5.1f}x"
+        )
+    
+    await client.drop_database(db.name)
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
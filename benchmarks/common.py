@@ -0,0 +1,119 @@
+"""
+Shared helpers for benchmarks.
+Seeds a dedicated benchmark database and reports latency percentiles.
+"""
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.db.collections import create_indexes, USERS_COLLECTION, TEAMS_COLLECTION, MEMBERSHIPS_COLLECTION, TASKS_COLLECTION
+from app.models.user import UserModel
+from app.models.team import TeamModel
+from app.models.membership import MembershipModel, Role
+from app.models.task import TaskModel
+
+
+# Benchmarks never touch the application database
+BENCH_DB_NAME = f"{settings.MONGODB_DB_NAME}_bench"
+
+
+async def get_bench_database():
+    """
+    Connect to MongoDB and return a freshly dropped benchmark database.
+    
+    Returns:
+        Tuple of (client, database)
+    """
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    await client.drop_database(BENCH_DB_NAME)
+    db = client[BENCH_DB_NAME]
+    await create_indexes(db)
+    return client, db
+
+
+async def seed_team(db, members: int = 200, tasks_per_member: int = 20) -> Dict:
+    """
+    Seed one team with an admin, a sub-admin managing half the members, and tasks.
+    
+    Args:
+        db: Database instance
+        members: Number of regular members
+        tasks_per_member: Tasks assigned to each member
+    
+    Returns:
+        Dictionary with the seeded admin, subadmin, member ids and task ids
+    """
+    users = [
+        UserModel.create_document(f"bench{i}@example.com", "x", f"Bench User {i}")
+        for i in range(members + 2)
+    ]
+    result = await db[USERS_COLLECTION].insert_many(users)
+    admin_id, subadmin_id, *member_ids = result.inserted_ids
+    
+    team = TeamModel.create_document("Benchmark Team", admin_id)
+    team_id = (await db[TEAMS_COLLECTION].insert_one(team)).inserted_id
+    
+    memberships = [
+        MembershipModel.create_document(admin_id, team_id, Role.ADMIN),
+        MembershipModel.create_document(subadmin_id, team_id, Role.SUBADMIN),
+    ]
+    for i, member_id in enumerate(member_ids):
+        managed_by = subadmin_id if i % 2 == 0 else None
+        memberships.append(
+            MembershipModel.create_document(member_id, team_id, Role.MEMBER, managed_by)
+        )
+    await db[MEMBERSHIPS_COLLECTION].insert_many(memberships)
+    
+    tasks = [
+        TaskModel.create_document(
+            f"Task {i}-{j}", team_id, member_id, admin_id,
+            description="x" * 500,
+            manager_ids=[subadmin_id] if i % 2 == 0 else []
+        )
+        for i, member_id in enumerate(member_ids)
+        for j in range(tasks_per_member)
+    ]
+    task_ids = (await db[TASKS_COLLECTION].insert_many(tasks)).inserted_ids
+    
+    return {
+        "team_id": team_id,
+        "admin_id": admin_id,
+        "subadmin_id": subadmin_id,
+        "member_ids": member_ids,
+        "task_ids": task_ids,
+    }
+
+
+async def measure(fn: Callable[[], Awaitable], iterations: int) -> List[float]:
+    """
+    Run an async callable repeatedly and collect latencies in milliseconds.
+    
+    Args:
+        fn: Coroutine function to time
+        iterations: Number of timed runs (after a short warm-up)
+    
+    Returns:
+        List of latencies in milliseconds
+    """
+    for _ in range(min(10, iterations)):
+        await fn()
+    
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    """Print p50/p95/mean latency for a set of samples."""
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"  {label:<28} p50={statistics.median(ordered):7.3f} ms  "
+        f"p95={p95:7.3f} ms  mean={statistics.fmean(ordered):7.3f} ms"
+    )
@@ -0,0 +1,177 @@
+"""
+Explain-plan regression check for the service query shapes.
+
+Seeds the benchmark database, runs `explain` (executionStats) on every
+query shape issued by the services and RBAC dependencies, and fails if a
+plan uses a collection scan, sorts in memory, or examines too many index
+keys or documents per returned document.
+
+Usage:
+    python -m benchmarks.query_plans [--max-ratio 2.0]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from bson import SON
+
+from app.db.collections import USERS_COLLECTION, MEMBERSHIPS_COLLECTION, TASKS_COLLECTION, TASK_TOMBSTONES_COLLECTION
+from app.models.membership import ACTIVE_MEMBERSHIP_FILTER
+from benchmarks.common import get_bench_database, seed_team
+
+
+# Plan stages that indicate a missing or mismatched index
+FORBIDDEN_STAGES = {"COLLSCAN", "SORT"}
+
+
+def query_shapes(seeded: Dict[str, Any]) -> List[Tuple[str, str, Dict, Optional[Dict], int]]:
+    """
+    Build one concrete query per shape used by the application.
+    
+    Args:
+        seeded: Ids returned by `seed_team`
+    
+    Returns:
+        List of (name, collection, filter, sort, limit) tuples
+    """
+    team_id = seeded["team_id"]
+    subadmin_id = seeded["subadmin_id"]
+    member_id = seeded["member_ids"][0]
+    task_ids = seeded["task_ids"]
+    page = [("_id", 1)]
+    by_title = [("title_key", 1), ("_id", 1)]
+    inbox = [("updated_at", -1), ("_id", -1)]
+    by_update = [("updated_at", 1), ("_id", 1)]
+    by_delete = [("deleted_at", 1), ("_id", 1)]
+    
+    return [
+        # AuthService.register_user / authenticate_user
+        ("users by email", USERS_COLLECTION, {"email": "bench1@example.com"}, None, 0),
+        # get_current_user, TaskService.populate_tasks
+        ("users by _id", USERS_COLLECTION, {"_id": {"$in": [member_id, subadmin_id]}}, None, 0),
+        # PermissionService.load (team permission snapshot)
+        ("active memberships of a team", MEMBERSHIPS_COLLECTION, {"team_id": team_id, **ACTIVE_MEMBERSHIP_FILTER}, None, 0),
+        # TaskService.create_task
+        ("membership by user and team", MEMBERSHIPS_COLLECTION, {"user_id": member_id, "team_id": team_id}, None, 0),
+        # get_user_memberships
+        ("memberships by user", MEMBERSHIPS_COLLECTION, {"user_id": {"$in": [member_id, subadmin_id]}, **ACTIVE_MEMBERSHIP_FILTER}, None, 0),
+        # TeamService.list_user_teams
+        ("teams page of a user", MEMBERSHIPS_COLLECTION, {"user_id": member_id, **ACTIVE_MEMBERSHIP_FILTER}, [("team_id", 1)], 100),
+        # MembershipService.get_team_members pages and filters
+        ("members page", MEMBERSHIPS_COLLECTION, {"team_id": team_id}, page, 100),
+        ("members page by role", MEMBERSHIPS_COLLECTION, {"team_id": team_id, "role": "member"}, page, 100),
+        ("members page by manager", MEMBERSHIPS_COLLECTION, {"team_id": team_id, "managed_by": subadmin_id}, page, 100),
+        # MembershipService.get_managed_members
+        ("managed memberships", MEMBERSHIPS_COLLECTION, {"team_id": team_id, "ancestors": subadmin_id}, None, 0),
+        # MembershipService._rewrite_chains batches
+        ("subtree batch", MEMBERSHIPS_COLLECTION, {"team_id": team_id, "ancestors": subadmin_id}, page, 500),
+        # TaskService.list_tasks for each visibility scope
+        ("tasks page (admin)", TASKS_COLLECTION, {"team_id": team_id}, page, 100),
+        ("tasks page (subadmin)", TASKS_COLLECTION, {"team_id": team_id, "manager_ids": subadmin_id}, page, 100),
+        ("tasks page (member)", TASKS_COLLECTION, {"team_id": team_id, "assigned_to": member_id}, page, 100),
+        ("tasks page after cursor", TASKS_COLLECTION, {"team_id": team_id, "_id": {"$gt": task_ids[len(task_ids) // 2]}}, page, 100),
+        # TaskService.prefix_search_tasks for each visibility scope
+        ("title prefix (admin)", TASKS_COLLECTION, {"team_id": team_id, "title_key": {"$regex": "^task 1"}}, by_title, 20),
+        ("title prefix (subadmin)", TASKS_COLLECTION, {"team_id": team_id, "manager_ids": subadmin_id, "title_key": {"$regex": "^task 0"}}, by_title, 20),
+        ("title prefix (member)", TASKS_COLLECTION, {"team_id": team_id, "assigned_to": member_id, "title_key": {"$regex": "^task 0"}}, by_title, 20),
+        # TaskService.list_assigned_tasks ("my tasks" inbox)
+        ("inbox page", TASKS_COLLECTION, {"assigned_to": member_id, "status": {"$in": ["todo", "in_progress", "done"]}, "team_id": {"$in": [team_id]}}, inbox, 50),
+        ("inbox page by status", TASKS_COLLECTION, {"assigned_to": member_id, "status": {"$in": ["todo"]}, "team_id": {"$in": [team_id]}}, inbox, 50),
+        # TaskService.list_changes (delta sync)
+        ("changes since", TASKS_COLLECTION, {"team_id": team_id, "updated_at": {"$gte": datetime(1970, 1, 1)}}, by_update, 500),
+        ("tombstones since", TASK_TOMBSTONES_COLLECTION, {"team_id": team_id, "deleted_at": {"$gte": datetime(1970, 1, 1)}}, by_delete, 500),
+        # TaskService.get_task, get_visible_task
+        ("task by _id", TASKS_COLLECTION, {"_id": task_ids[0]}, None, 0),
+        # Conditional writes with a permission filter (task_update_filter)
+        ("task by _id with permissions", TASKS_COLLECTION, {
+            "_id": task_ids[0],
+            "$or": [
+                {"team_id": {"$in": [team_id]}, "assigned_to": member_id},
+                {"team_id": {"$in": [team_id]}, "manager_ids": subadmin_id},
+            ]
+        }, None, 0),
+        # TeamDeletionService.run batches
+        ("team deletion batch (tasks)", TASKS_COLLECTION, {"team_id": team_id}, page, 1000),
+        ("team deletion batch (memberships)", MEMBERSHIPS_COLLECTION, {"team_id": team_id}, page, 1000),
+        # MembershipService._apply_chains
+        ("tasks of a member", TASKS_COLLECTION, {"team_id": team_id, "assigned_to": member_id, "manager_ids": {"$ne": [subadmin_id]}}, None, 0),
+    ]
+
+
+def iter_stages(plan: Any) -> Iterator[str]:
+    """Yield every stage name in an explain plan tree."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from iter_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from iter_stages(item)
+
+
+def check_plan(explain: Dict[str, Any], max_ratio: float) -> List[str]:
+    """
+    Check one explain result.
+    
+    Args:
+        explain: Output of the explain command with executionStats
+        max_ratio: Maximum examined keys/documents per returned document
+    
+    Returns:
+        List of problems found (empty if the plan is acceptable)
+    """
+    problems = []
+    
+    stages = set(iter_stages(explain["queryPlanner"]["winningPlan"]))
+    for stage in sorted(stages & FORBIDDEN_STAGES):
+        problems.append(f"plan uses {stage}")
+    
+    stats = explain["executionStats"]
+    returned = max(stats["nReturned"], 1)
+    examined = max(stats["totalKeysExamined"], stats["totalDocsExamined"])
+    ratio = examined / returned
+    if ratio > max_ratio:
+        problems.append(f"examined/returned ratio {ratio:.1f} > {max_ratio}")
+    
+    return problems
+
+
+async def main(max_ratio: float) -> int:
+    client, db = await get_bench_database()
+    seeded = await seed_team(db)
+    
+    failures = 0
+    for name, collection, query, sort, limit in query_shapes(seeded):
+        find = SON([("find", collection), ("filter", query)])
+        if sort:
+            find["sort"] = SON(sort)
+        if limit:
+            find["limit"] = limit
+        
+        explain = await db.command(SON([("explain", find), ("verbosity", "executionStats")]))
+        problems = check_plan(explain, max_ratio)
+        
+        if problems:
+            failures += 1
+            print(f"✗ {name}: {'; '.join(problems)}")
+        else:
+            print(f"✓ {name}")
+    
+    await client.drop_database(db.name)
+    client.close()
+    
+    print(f"\n{failures} query shape(s) failed" if failures else "\nAll query shapes use indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--max-ratio", type=float, default=2.0,
+        help="Maximum examined keys/documents per returned document"
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.max_ratio)))
@@ -0,0 +1,76 @@
+"""
+Microbenchmark: rendering a 100-task list response.
+
+Compares the previous path (ObjectIds converted to str by hand, then
+FastAPI validating the dicts through List[TaskResponse] and encoding
+them with the standard JSON encoder) with DocumentSerializer +
+BSONJSONResponse. No database is needed.
+
+Usage:
+    python -m benchmarks.serialization [iterations]
+"""
+import asyncio
+import sys
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.serialization import DocumentSerializer
+from app.schemas.task import TaskResponse
+from benchmarks.common import measure, report
+
+
+def make_tasks(count: int = 100) -> List[dict]:
+    """Build populated task documents as returned by TaskService.list_tasks."""
+    team_id, creator_id = ObjectId(), ObjectId()
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Task {i}",
+            "description": "x" * 2000,
+            "team_id": team_id,
+            "assigned_to": ObjectId(),
+            "created_by": creator_id,
+            "manager_ids": [],
+            "status": "todo",
+            "priority": "medium",
+            "created_at": now,
+            "updated_at": now,
+            "assigned_to_name": f"User {i}",
+            "created_by_name": "Creator",
+            "team_name": "Team",
+        }
+        for i in range(count)
+    ]
+
+
+async def main(iterations: int) -> None:
+    tasks = make_tasks()
+    field = create_response_field(name="Response_list_tasks", type_=List[TaskResponse])
+    serializer = DocumentSerializer(TaskResponse)
+    
+    async def legacy():
+        docs = [dict(task) for task in tasks]
+        for task in docs:
+            task["_id"] = str(task["_id"])
+            task["team_id"] = str(task["team_id"])
+            task["assigned_to"] = str(task["assigned_to"])
+            task["created_by"] = str(task["created_by"])
+        content = await serialize_response(field=field, response_content=docs, is_coroutine=True)
+        return JSONResponse(content).body
+    
+    async def current():
+        return serializer.response(tasks).body
+    
+    print(f"100-task list response rendering ({iterations} iterations)")
+    report("legacy (validate + json)", await measure(legacy, iterations))
+    report("DocumentSerializer (orjson)", await measure(current, iterations))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
@@ -0,0 +1,63 @@
+"""
+Benchmark: GET /tasks/{task_id} visibility check.
+
+Compares the previous read path (task lookup, membership lookup, managed
+member scan for sub-admins, then a filtered re-read) with
+`get_visible_task`, for each role.
+
+Usage:
+    python -m benchmarks.task_read [iterations]
+"""
+import asyncio
+import random
+import sys
+
+from app.db.collections import TASKS_COLLECTION
+from app.dependencies.rbac import filter_visible_tasks, get_visible_task
+from benchmarks.common import get_bench_database, seed_team, measure, report
+
+
+async def legacy_get_task(db, task_id, current_user):
+    """Read path used by the route before the single visibility check."""
+    task = await db[TASKS_COLLECTION].find_one({"_id": task_id})
+    task_filter = await filter_visible_tasks(str(task["team_id"]), current_user, db)
+    task_filter["_id"] = task_id
+    return await db[TASKS_COLLECTION].find_one(task_filter)
+
+
+async def main(iterations: int) -> None:
+    client, db = await get_bench_database()
+    seeded = await seed_team(db)
+    
+    # Tasks of the first member are visible to every role below
+    member_id = seeded["member_ids"][0]
+    visible_ids = [
+        t["_id"] for t in await db[TASKS_COLLECTION].find(
+            {"assigned_to": member_id}, {"_id": 1}
+        ).to_list(length=None)
+    ]
+    callers = {
+        "admin": seeded["admin_id"],
+        "subadmin": seeded["subadmin_id"],
+        "member": member_id,
+    }
+    
+    print(f"GET /tasks/{{task_id}} read path ({iterations} iterations)")
+    for role, user_id in callers.items():
+        current_user = {"_id": user_id}
+        
+        async def legacy():
+            await legacy_get_task(db, random.choice(visible_ids), current_user)
+        
+        async def current():
+            await get_visible_task(random.choice(visible_ids), current_user, db)
+        
+        report(f"{role} / legacy", await measure(legacy, iterations))
+        report(f"{role} / get_visible_task", await measure(current, iterations))
+    
+    await client.drop_database(db.name)
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,57 @@
+"""
+Benchmark: task search latency.
+
+Measures type-ahead (title prefix) and full-text search through the
+service layer for each role, typing 1-6 characters of existing titles.
+The type-ahead target is under 50 ms at p95 on large teams; pass a
+larger tasks-per-member count to seed one.
+
+Usage:
+    python -m benchmarks.task_search [iterations] [tasks_per_member]
+"""
+import asyncio
+import random
+import sys
+
+from app.dependencies.rbac import filter_visible_tasks
+from app.services.task_service import TaskService
+from benchmarks.common import get_bench_database, seed_team, measure, report
+
+
+async def main(iterations: int, tasks_per_member: int) -> None:
+    client, db = await get_bench_database()
+    seeded = await seed_team(db, tasks_per_member=tasks_per_member)
+    team_id = str(seeded["team_id"])
+    
+    # Prefixes of titles the member can see, so every role gets matches
+    member_id = seeded["member_ids"][0]
+    titles = [f"Task 0-{j}" for j in range(tasks_per_member)]
+    callers = {
+        "admin": seeded["admin_id"],
+        "subadmin": seeded["subadmin_id"],
+        "member": member_id,
+    }
+    
+    print(f"Task search, {len(seeded['task_ids'])} tasks ({iterations} iterations)")
+    for role, user_id in callers.items():
+        task_filter = await filter_visible_tasks(team_id, {"_id": user_id}, db)
+        
+        async def prefix():
+            title = random.choice(titles)
+            await TaskService.prefix_search_tasks(db, task_filter, title[:random.randint(1, 6)])
+        
+        async def text():
+            await TaskService.search_tasks(db, task_filter, random.choice(titles))
+        
+        report(f"{role} / prefix", await measure(prefix, iterations))
+        report(f"{role} / text", await measure(text, iterations))
+    
+    await client.drop_database(db.name)
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    ))
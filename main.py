@@ -7,9 +7,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.etag import ETAG_HEADER
+from app.core.metrics import collect_metrics
+from app.core.events import event_hub
 from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_database
 from app.db.collections import create_indexes
-from app.routes import auth, teams, memberships, tasks
+from app.db.migrations import run_migrations
+from app.services.team_deletion_service import TeamDeletionService
+from app.services.team_stats_service import TeamStatsService
+from app.routes import auth, teams, memberships, tasks, jobs, events, me
 
 
 @asynccontextmanager
@@ -18,14 +25,22 @@ async def lifespan(app: FastAPI):
     Application lifespan manager.
     Handles startup and shutdown events.
     """
-    # Startup: Connect to MongoDB and create indexes
+    # Startup: Connect to MongoDB, create indexes, apply migrations and
+    # resume background jobs
     await connect_to_mongo()
+    await event_hub.start()
     db = get_database()
     await create_indexes(db)
+    await run_migrations(db)
+    await TeamDeletionService.resume_pending(db)
+    TeamStatsService.start_reconciler(db)
     
     yield
     
-    # Shutdown: Close MongoDB connection
+    # Shutdown: Stop background jobs, then close MongoDB connection
+    await TeamStatsService.shutdown()
+    await TeamDeletionService.shutdown()
+    await event_hub.stop()
     await close_mongo_connection()
 
 
@@ -45,6 +60,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
 )
 
 
@@ -53,6 +69,9 @@ app.include_router(auth.router, prefix="/api/v1")
 app.include_router(teams.router, prefix="/api/v1")
 app.include_router(memberships.router, prefix="/api/v1")
 app.include_router(tasks.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
+app.include_router(events.router, prefix="/api/v1")
+app.include_router(me.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -69,3 +88,9 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """In-process metrics for this worker (cache hit rates, evictions)."""
+    return collect_metrics()